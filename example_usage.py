@@ -5,9 +5,8 @@ This script demonstrates how to use the framework to analyze contracts
 and generate trading signals.
 """
 
-import asyncio
-import json
 from kalshi_hedge_fund import KalshiHedgeFund
+from kalshi_hedge_fund.utils import dump_json_async, run_async
 
 
 async def main():
@@ -23,6 +22,9 @@ async def main():
         return
     
     try:
+        # Open API connections before the first request
+        await hedge_fund.startup()
+        
         # Example 1: Analyze a single contract
         print("=== Example 1: Analyzing a single contract ===")
         
@@ -49,8 +51,7 @@ async def main():
                 "signal": signal
             }
             
-            with open("example_analysis.json", "w") as f:
-                json.dump(results, f, indent=2, default=str)
+            await dump_json_async(results, "example_analysis.json")
             print("Results saved to example_analysis.json")
             
         except Exception as e:
@@ -65,8 +66,7 @@ async def main():
             print(f"Number of positions: {portfolio_status.get('portfolio', {}).get('positions', [])}")
             
             # Save portfolio status
-            with open("portfolio_status.json", "w") as f:
-                json.dump(portfolio_status, f, indent=2, default=str)
+            await dump_json_async(portfolio_status, "portfolio_status.json")
             print("Portfolio status saved to portfolio_status.json")
             
         except Exception as e:
@@ -90,8 +90,7 @@ async def main():
                 "count": len(contracts)
             }
             
-            with open("search_results.json", "w") as f:
-                json.dump(search_results, f, indent=2, default=str)
+            await dump_json_async(search_results, "search_results.json")
             print("Search results saved to search_results.json")
             
         except Exception as e:
@@ -124,8 +123,7 @@ async def main():
                     print(f"  {action}: {count}")
                 
                 # Save strategy results
-                with open("strategy_results.json", "w") as f:
-                    json.dump(strategy_results, f, indent=2, default=str)
+                await dump_json_async(strategy_results, "strategy_results.json")
                 print("Strategy results saved to strategy_results.json")
             else:
                 print("No active contracts found")
@@ -141,4 +139,4 @@ async def main():
 
 if __name__ == "__main__":
     # Run the example
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
@@ -3,16 +3,41 @@ Command Line Interface for Kalshi AI Hedge Fund Framework
 
 This module provides a CLI for interacting with the framework,
 including running strategies, analyzing contracts, and monitoring performance.
+
+Commands run in-process by default. When a daemon started with
+`kalshi-hedge-fund daemon` is listening and its socket is passed via
+--socket (or KALSHI_HEDGE_FUND_SOCKET), commands are forwarded to it so the
+framework is initialized once and reused across invocations.
 """
 
 import asyncio
 import click
-import json
-from typing import List, Optional
+import os
+import time
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 from .core import KalshiHedgeFund
 from .config import Config
+from .utils.event_loop import run_async
+from .utils.serialization import dump_json_async, dumps_json, loads_json
+from .utils.timestamps import with_iso_timestamps
+
+
+def _default_socket_path() -> str:
+    """Per-user daemon socket path, preferring $XDG_RUNTIME_DIR"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "kalshi-hedge-fund.sock")
+    return os.path.join("/tmp", f"kalshi-hedge-fund-{os.getuid()}.sock")
+
+
+DEFAULT_SOCKET_PATH = _default_socket_path()
+
+socket_option = click.option(
+    '--socket', 'socket_path', envvar='KALSHI_HEDGE_FUND_SOCKET',
+    help='Unix socket of a running daemon to forward the command to'
+)
 
 
 @click.group()
@@ -26,31 +51,36 @@ def cli():
 @click.option('--config', '-c', 'config_path', help='Path to configuration file')
 @click.option('--contract-id', '-i', help='Contract ID to analyze')
 @click.option('--output', '-o', help='Output file for results (JSON)')
-def analyze(config_path: Optional[str], contract_id: Optional[str], output: Optional[str]):
+@socket_option
+def analyze(config_path: Optional[str], contract_id: Optional[str], output: Optional[str],
+            socket_path: Optional[str]):
     """Analyze a single contract"""
-    asyncio.run(_analyze_contract(config_path, contract_id, output))
+    run_async(_analyze_contract(config_path, contract_id, output, socket_path))
 
 
 @cli.command()
 @click.option('--config', '-c', 'config_path', help='Path to configuration file')
 @click.option('--contracts', '-i', help='Comma-separated list of contract IDs')
 @click.option('--output', '-o', help='Output file for results (JSON)')
-def run_strategy(config_path: Optional[str], contracts: Optional[str], output: Optional[str]):
+@socket_option
+def run_strategy(config_path: Optional[str], contracts: Optional[str], output: Optional[str],
+                 socket_path: Optional[str]):
     """Run the complete strategy on multiple contracts"""
     if contracts:
         contract_ids = [cid.strip() for cid in contracts.split(',')]
     else:
         contract_ids = []
     
-    asyncio.run(_run_strategy(config_path, contract_ids, output))
+    run_async(_run_strategy(config_path, contract_ids, output, socket_path))
 
 
 @cli.command()
 @click.option('--config', '-c', 'config_path', help='Path to configuration file')
 @click.option('--output', '-o', help='Output file for results (JSON)')
-def portfolio_status(config_path: Optional[str], output: Optional[str]):
+@socket_option
+def portfolio_status(config_path: Optional[str], output: Optional[str], socket_path: Optional[str]):
     """Get current portfolio status and risk metrics"""
-    asyncio.run(_get_portfolio_status(config_path, output))
+    run_async(_get_portfolio_status(config_path, output, socket_path))
 
 
 @cli.command()
@@ -58,62 +88,203 @@ def portfolio_status(config_path: Optional[str], output: Optional[str]):
 @click.option('--query', '-q', help='Search query for contracts')
 @click.option('--limit', '-l', default=10, help='Maximum number of results')
 @click.option('--output', '-o', help='Output file for results (JSON)')
-def search_contracts(config_path: Optional[str], query: str, limit: int, output: Optional[str]):
+@socket_option
+def search_contracts(config_path: Optional[str], query: str, limit: int, output: Optional[str],
+                     socket_path: Optional[str]):
     """Search for contracts"""
-    asyncio.run(_search_contracts(config_path, query, limit, output))
+    run_async(_search_contracts(config_path, query, limit, output, socket_path))
 
 
-async def _analyze_contract(config_path: Optional[str], contract_id: Optional[str], output: Optional[str]):
-    """Analyze a single contract"""
+@cli.command()
+@click.option('--config', '-c', 'config_path', help='Path to configuration file')
+@click.option('--socket', 'socket_path', default=DEFAULT_SOCKET_PATH, show_default=True,
+              help='Unix socket path to listen on')
+def daemon(config_path: Optional[str], socket_path: str):
+    """Run a long-lived framework instance that serves CLI commands"""
     try:
-        # Initialize framework
-        hedge_fund = KalshiHedgeFund(config_path=config_path)
+        run_async(_run_daemon(config_path, socket_path))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _do_analyze(hedge_fund: KalshiHedgeFund, contract_id: str) -> Dict[str, Any]:
+    """Fetch, analyze and generate a signal for a single contract"""
+    # Get contract
+    contract = await hedge_fund.get_contract(contract_id)
+    
+    # Analyze contract
+    analysis = await hedge_fund.analyze_contract(contract)
+    
+    # Generate signal
+    signal = await hedge_fund.generate_signal(analysis)
+    
+    return {
+        "contract": contract,
+        "analysis": analysis,
+        "signal": signal,
+        "timestamp": time.monotonic()
+    }
+
+
+async def _do_run_strategy(hedge_fund: KalshiHedgeFund, contract_ids: List[str]) -> Dict[str, Any]:
+    """Run the strategy on multiple contracts"""
+    return await hedge_fund.run_strategy(contract_ids)
+
+
+async def _do_portfolio_status(hedge_fund: KalshiHedgeFund) -> Dict[str, Any]:
+    """Get portfolio status"""
+    return await hedge_fund.get_portfolio_status()
+
+
+async def _do_search_contracts(hedge_fund: KalshiHedgeFund, query: str, limit: int) -> Dict[str, Any]:
+    """Search for contracts"""
+    contracts = await hedge_fund.kalshi_collector.search_contracts(query, limit)
+    
+    return {
+        "query": query,
+        "limit": limit,
+        "contracts": contracts,
+        "count": len(contracts),
+        "timestamp": time.monotonic()
+    }
+
+
+# Commands that can be executed in-process or by the daemon
+COMMANDS = {
+    "analyze": _do_analyze,
+    "run_strategy": _do_run_strategy,
+    "portfolio_status": _do_portfolio_status,
+    "search_contracts": _do_search_contracts,
+}
+
+
+async def _execute(command: str, args: Dict[str, Any], config_path: Optional[str],
+                   socket_path: Optional[str]) -> Dict[str, Any]:
+    """
+    Execute a command via the daemon if one is reachable, otherwise in-process
+    
+    Args:
+        command: Command name (key of COMMANDS)
+        args: Command keyword arguments
+        config_path: Path to configuration file (in-process only)
+        socket_path: Unix socket of a running daemon
+    
+    Returns:
+        Command results dictionary, with ISO timestamps added for output
+    """
+    if socket_path and os.path.exists(socket_path):
+        try:
+            return with_iso_timestamps(await _request_daemon(socket_path, command, args))
+        except (ConnectionError, FileNotFoundError):
+            click.echo(f"Daemon not reachable at {socket_path}, running in-process", err=True)
+    
+    # Initialize framework
+    hedge_fund = KalshiHedgeFund(config_path=config_path)
+    
+    try:
+        return with_iso_timestamps(await COMMANDS[command](hedge_fund, **args))
+    finally:
+        # Cleanup
+        await hedge_fund.shutdown()
+
+
+async def _request_daemon(socket_path: str, command: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one command to the daemon and return its results"""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    try:
+        writer.write(dumps_json({"command": command, "args": args}))
+        writer.write_eof()
+        await writer.drain()
         
+        response = loads_json(await reader.read())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["result"]
+
+
+async def _socket_is_live(socket_path: str) -> bool:
+    """Check whether something is still accepting connections on a socket path"""
+    try:
+        _, writer = await asyncio.open_unix_connection(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    writer.close()
+    await writer.wait_closed()
+    return True
+
+
+async def _run_daemon(config_path: Optional[str], socket_path: str):
+    """Serve CLI commands from a single framework instance over a Unix socket"""
+    hedge_fund = KalshiHedgeFund(config_path=config_path)
+    await hedge_fund.startup()
+    
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = loads_json(await reader.read())
+            result = await COMMANDS[request["command"]](hedge_fund, **request.get("args", {}))
+            response = {"result": result}
+        except Exception as e:
+            response = {"error": str(e)}
+        
+        try:
+            writer.write(dumps_json(response))
+            await writer.drain()
+        finally:
+            writer.close()
+    
+    # Remove a stale socket left by a previous daemon, but never a live one
+    if os.path.exists(socket_path):
+        if await _socket_is_live(socket_path):
+            await hedge_fund.shutdown()
+            raise click.ClickException(f"A daemon is already listening on {socket_path}")
+        os.unlink(socket_path)
+    
+    server = await asyncio.start_unix_server(handle, path=socket_path)
+    # Only the owning user may send commands to the daemon
+    os.chmod(socket_path, 0o600)
+    click.echo(f"Daemon listening on: {socket_path}")
+    
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await hedge_fund.shutdown()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+async def _analyze_contract(config_path: Optional[str], contract_id: Optional[str], output: Optional[str],
+                            socket_path: Optional[str] = None):
+    """Analyze a single contract"""
+    try:
         if not contract_id:
             click.echo("Error: Contract ID is required")
             return
         
         click.echo(f"Analyzing contract: {contract_id}")
         
-        # Get contract
-        contract = await hedge_fund.get_contract(contract_id)
-        
-        # Analyze contract
-        analysis = await hedge_fund.analyze_contract(contract)
-        
-        # Generate signal
-        signal = await hedge_fund.generate_signal(analysis)
-        
-        # Prepare results
-        results = {
-            "contract": contract,
-            "analysis": analysis,
-            "signal": signal,
-            "timestamp": asyncio.get_event_loop().time()
-        }
+        results = await _execute("analyze", {"contract_id": contract_id}, config_path, socket_path)
         
         # Output results
         if output:
-            with open(output, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+            await dump_json_async(results, output)
             click.echo(f"Results saved to: {output}")
         else:
-            click.echo(json.dumps(results, indent=2, default=str))
-        
-        # Cleanup
-        await hedge_fund.shutdown()
-        
+            click.echo(dumps_json(results).decode())
+    
     except Exception as e:
         click.echo(f"Error: {e}")
         return 1
 
 
-async def _run_strategy(config_path: Optional[str], contract_ids: List[str], output: Optional[str]):
+async def _run_strategy(config_path: Optional[str], contract_ids: List[str], output: Optional[str],
+                        socket_path: Optional[str] = None):
     """Run strategy on multiple contracts"""
     try:
-        # Initialize framework
-        hedge_fund = KalshiHedgeFund(config_path=config_path)
-        
         if not contract_ids:
             click.echo("Error: At least one contract ID is required")
             return
@@ -121,57 +292,45 @@ async def _run_strategy(config_path: Optional[str], contract_ids: List[str], out
         click.echo(f"Running strategy on {len(contract_ids)} contracts")
         
         # Run strategy
-        results = await hedge_fund.run_strategy(contract_ids)
+        results = await _execute("run_strategy", {"contract_ids": contract_ids}, config_path, socket_path)
         
         # Output results
         if output:
-            with open(output, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+            await dump_json_async(results, output)
             click.echo(f"Results saved to: {output}")
         else:
-            click.echo(json.dumps(results, indent=2, default=str))
-        
-        # Cleanup
-        await hedge_fund.shutdown()
-        
+            click.echo(dumps_json(results).decode())
+    
     except Exception as e:
         click.echo(f"Error: {e}")
         return 1
 
 
-async def _get_portfolio_status(config_path: Optional[str], output: Optional[str]):
+async def _get_portfolio_status(config_path: Optional[str], output: Optional[str],
+                                socket_path: Optional[str] = None):
     """Get portfolio status"""
     try:
-        # Initialize framework
-        hedge_fund = KalshiHedgeFund(config_path=config_path)
-        
         click.echo("Getting portfolio status...")
         
         # Get portfolio status
-        status = await hedge_fund.get_portfolio_status()
+        status = await _execute("portfolio_status", {}, config_path, socket_path)
         
         # Output results
         if output:
-            with open(output, 'w') as f:
-                json.dump(status, f, indent=2, default=str)
+            await dump_json_async(status, output)
             click.echo(f"Portfolio status saved to: {output}")
         else:
-            click.echo(json.dumps(status, indent=2, default=str))
-        
-        # Cleanup
-        await hedge_fund.shutdown()
-        
+            click.echo(dumps_json(status).decode())
+    
     except Exception as e:
         click.echo(f"Error: {e}")
         return 1
 
 
-async def _search_contracts(config_path: Optional[str], query: str, limit: int, output: Optional[str]):
+async def _search_contracts(config_path: Optional[str], query: str, limit: int, output: Optional[str],
+                            socket_path: Optional[str] = None):
     """Search for contracts"""
     try:
-        # Initialize framework
-        hedge_fund = KalshiHedgeFund(config_path=config_path)
-        
         if not query:
             click.echo("Error: Search query is required")
             return
@@ -179,28 +338,17 @@ async def _search_contracts(config_path: Optional[str], query: str, limit: int,
         click.echo(f"Searching for contracts: {query}")
         
         # Search contracts
-        contracts = await hedge_fund.kalshi_collector.search_contracts(query, limit)
-        
-        # Prepare results
-        results = {
-            "query": query,
-            "limit": limit,
-            "contracts": contracts,
-            "count": len(contracts),
-            "timestamp": asyncio.get_event_loop().time()
-        }
+        results = await _execute(
+            "search_contracts", {"query": query, "limit": limit}, config_path, socket_path
+        )
         
         # Output results
         if output:
-            with open(output, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+            await dump_json_async(results, output)
             click.echo(f"Search results saved to: {output}")
         else:
-            click.echo(json.dumps(results, indent=2, default=str))
-        
-        # Cleanup
-        await hedge_fund.shutdown()
-        
+            click.echo(dumps_json(results).decode())
+    
     except Exception as e:
         click.echo(f"Error: {e}")
         return 1
@@ -212,4 +360,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,5 +3,6 @@ Configuration module for Kalshi AI Hedge Fund Framework
 """
 
 from .config import Config
+from .loader import load_config
 
-__all__ = ["Config"]
\ No newline at end of file
+__all__ = ["Config", "load_config"]
\ No newline at end of file
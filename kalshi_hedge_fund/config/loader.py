@@ -0,0 +1,31 @@
+"""
+Configuration loading helpers for Kalshi AI Hedge Fund Framework
+"""
+
+import os
+from functools import lru_cache
+
+from .config import Config
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int) -> Config:
+    """Parse a configuration file (cached per path and modification time)"""
+    return Config.from_file(path)
+
+
+def load_config(path: str) -> Config:
+    """
+    Load configuration from a file, reusing the parsed result while the file is unchanged
+    
+    The cache key includes the file's modification time, so editing the file
+    invalidates the cached configuration automatically.
+    
+    Args:
+        path: Path to configuration file
+        
+    Returns:
+        Configuration object
+    """
+    path = os.path.abspath(path)
+    return _load_config_cached(path, os.stat(path).st_mtime_ns)
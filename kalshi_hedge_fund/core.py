@@ -6,18 +6,61 @@ of the AI-powered hedge fund framework.
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Set, Tuple
 from loguru import logger
 
-from .config import Config
+from .config import Config, load_config
 from .data.collectors.kalshi_api import KalshiAPICollector
 from .research.llm_agent.reasoning_engine import LLMReasoningEngine
-from .analysis.models.ensemble import EnsembleModel
+from .analysis.models.ensemble import EnsembleModel, analyze_contracts_chunk, init_analysis_worker
 from .trading.strategy.signal_generator import SignalGenerator
 from .trading.execution.kalshi_trader import KalshiTrader
 from .risk.monitors.exposure_monitor import ExposureMonitor
 from .utils.logger import setup_logging
 
+# Runs over fewer contracts than this are analyzed in-process; below it,
+# process start-up and pickling cost more than the parallel speedup saves
+PARALLEL_ANALYSIS_MIN_CONTRACTS = 1000
+
+# Contracts processed concurrently by run_strategy unless configured
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Contracts fetched and batch-analyzed together by run_strategy unless
+# configured; the next chunk is fetched while the current one is processed
+DEFAULT_STRATEGY_CHUNK_SIZE = 100
+
+# Exact-match analysis cache bounds
+ANALYSIS_CACHE_SIZE = 10000
+ANALYSIS_CACHE_TTL = 300.0  # seconds
+
+
+@dataclass(slots=True)
+class ContractResult:
+    """Outcome of running the strategy on one contract"""
+    
+    contract_id: str
+    analysis: Optional[Dict[str, Any]] = None
+    signal: Optional[Dict[str, Any]] = None
+    execution: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the result dictionary returned by run_strategy"""
+        if self.error is not None:
+            return {"contract_id": self.contract_id, "error": self.error}
+        return {
+            "contract_id": self.contract_id,
+            "analysis": self.analysis,
+            "signal": self.signal,
+            "execution": self.execution,
+        }
+
 
 class KalshiHedgeFund:
     """
@@ -39,7 +82,7 @@ class KalshiHedgeFund:
         if config is not None:
             self.config = config
         elif config_path is not None:
-            self.config = Config.from_file(config_path)
+            self.config = load_config(config_path)
         else:
             self.config = Config()
         
@@ -51,6 +94,22 @@ class KalshiHedgeFund:
         
         logger.info("Initializing Kalshi AI Hedge Fund Framework")
         
+        # Worker processes for large analysis batches (started on first use)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        
+        # Ensemble analysis runs off the event loop in a single thread, which
+        # also keeps the model's buffers and caches single-threaded
+        self._analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ensemble")
+        
+        # Serializes signal generation and trade execution across contracts
+        self._trade_lock = asyncio.Lock()
+        
+        # Position updates running in the background after trade execution
+        self._position_updates: Set[asyncio.Task] = set()
+        
+        # Analyses of unchanged contracts, keyed by _analysis_cache_key
+        self._analysis_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        
         # Initialize components
         self._initialize_components()
         
@@ -82,6 +141,20 @@ class KalshiHedgeFund:
             logger.error(f"Failed to initialize components: {e}")
             raise
     
+    @staticmethod
+    def _now() -> float:
+        """Current event loop time (monotonic seconds)"""
+        return asyncio.get_running_loop().time()
+    
+    async def startup(self):
+        """
+        Warm up network connections ahead of the first request
+        
+        Call once before run_strategy in long-running processes so the first
+        contract fetch does not pay connection setup.
+        """
+        await self.kalshi_collector.warmup()
+    
     async def get_contract(self, contract_id: str) -> Dict[str, Any]:
         """
         Retrieve contract information from Kalshi
@@ -94,46 +167,88 @@ class KalshiHedgeFund:
         """
         try:
             contract = await self.kalshi_collector.get_contract(contract_id)
-            logger.info(f"Retrieved contract: {contract_id}")
+            logger.info("Retrieved contract: {}", contract_id)
             return contract
         except Exception as e:
             logger.error(f"Failed to retrieve contract {contract_id}: {e}")
             raise
     
-    async def analyze_contract(self, contract: Dict[str, Any]) -> Dict[str, Any]:
+    async def analyze_contract(self, contract: Dict[str, Any],
+                               statistical_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Perform comprehensive analysis of a contract
         
         Args:
             contract: Contract information dictionary
+            statistical_analysis: Precomputed ensemble analysis (e.g. from a batch run)
             
         Returns:
             Analysis results dictionary
         """
         try:
-            logger.info(f"Starting analysis for contract: {contract.get('id', 'unknown')}")
+            # Reuse the analysis of an unchanged contract
+            cache_key = self._analysis_cache_key(contract)
+            if cache_key is not None:
+                cached = self._analysis_cache.get(cache_key)
+                if cached is not None and time.monotonic() - cached[0] < ANALYSIS_CACHE_TTL:
+                    logger.info("Using cached analysis for contract: {}", contract.get("id", "unknown"))
+                    if statistical_analysis is None:
+                        return cached[1]
+                    # Keep the cached LLM analysis but use the caller's statistics
+                    return {**cached[1], "statistical_analysis": statistical_analysis, "timestamp": self._now()}
             
-            # LLM-based research and reasoning
-            llm_analysis = await self.llm_engine.analyze_event(contract)
-            
-            # Statistical analysis
-            statistical_analysis = await self.ensemble_model.analyze_contract(contract)
+            if statistical_analysis is None:
+                # LLM-based research and statistical analysis, overlapped: the
+                # ensemble math runs while the LLM request is in flight
+                llm_analysis, statistical_analysis = await asyncio.gather(
+                    self.llm_engine.analyze_event(contract),
+                    asyncio.get_running_loop().run_in_executor(
+                        self._analysis_executor, self.ensemble_model.analyze_contract_sync, contract
+                    )
+                )
+            else:
+                # LLM-based research and reasoning
+                llm_analysis = await self.llm_engine.analyze_event(contract)
             
             # Combine analyses
             analysis = {
                 "contract_id": contract.get("id"),
                 "llm_analysis": llm_analysis,
                 "statistical_analysis": statistical_analysis,
-                "timestamp": asyncio.get_event_loop().time(),
+                "timestamp": self._now(),
             }
             
-            logger.info(f"Analysis completed for contract: {contract.get('id', 'unknown')}")
+            # Fallback LLM results may stem from a transient failure; don't keep them
+            if cache_key is not None and llm_analysis.get("model") != "fallback":
+                if len(self._analysis_cache) >= ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.pop(next(iter(self._analysis_cache)))
+                self._analysis_cache[cache_key] = (time.monotonic(), analysis)
+            
+            logger.info("Analysis completed for contract: {}", contract.get("id", "unknown"))
             return analysis
             
         except Exception as e:
             logger.error(f"Failed to analyze contract: {e}")
             raise
     
+    def _analysis_cache_key(self, contract: Dict[str, Any]) -> Optional[str]:
+        """
+        Cache key identifying a contract version and price and the LLM model analyzing it
+        
+        Args:
+            contract: Contract information dictionary
+            
+        Returns:
+            Hex digest key, or None if the contract carries no id or version stamp
+        """
+        contract_id = contract.get("id")
+        updated_at = contract.get("updated_at")
+        if contract_id is None or updated_at is None:
+            return None
+        
+        fingerprint = f"{contract_id}|{updated_at}|{contract.get('current_price')}|{self.config.llm_model}"
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+    
     async def generate_signal(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate trading signal based on analysis
@@ -145,10 +260,11 @@ class KalshiHedgeFund:
             Trading signal dictionary
         """
         try:
-            logger.info("Generating trading signal")
-            
             signal = await self.signal_generator.generate_signal(analysis)
             
+            # Risk checks must see the positions of every executed trade
+            await self._wait_for_position_updates()
+            
             # Apply risk checks
             if await self.exposure_monitor.check_signal(signal):
                 logger.info("Signal passed risk checks")
@@ -176,21 +292,29 @@ class KalshiHedgeFund:
                 logger.info("Signal confidence below threshold, skipping execution")
                 return {"status": "SKIPPED", "reason": "Low confidence"}
             
-            logger.info(f"Executing trade: {signal}")
+            logger.info("Executing trade: {}", signal)
             
             # Execute the trade
             execution_result = await self.kalshi_trader.execute_signal(signal)
             
-            # Update risk monitoring
-            await self.exposure_monitor.update_positions(execution_result)
+            # Update risk monitoring in the background; the next risk check
+            # waits for it
+            task = asyncio.create_task(self.exposure_monitor.update_positions(execution_result))
+            self._position_updates.add(task)
+            task.add_done_callback(self._position_updates.discard)
             
-            logger.info(f"Trade executed successfully: {execution_result}")
+            logger.info("Trade executed successfully: {}", execution_result)
             return execution_result
             
         except Exception as e:
             logger.error(f"Failed to execute trade: {e}")
             raise
     
+    async def _wait_for_position_updates(self):
+        """Wait for background position updates to finish"""
+        if self._position_updates:
+            await asyncio.gather(*self._position_updates, return_exceptions=True)
+    
     async def run_strategy(self, contract_ids: List[str]) -> Dict[str, Any]:
         """
         Run the complete strategy for a list of contracts
@@ -204,49 +328,183 @@ class KalshiHedgeFund:
         try:
             logger.info(f"Running strategy for {len(contract_ids)} contracts")
             
-            results = []
-            for contract_id in contract_ids:
+            # Bound the number of contracts in flight to protect LLM and
+            # trading API rate limits
+            semaphore = asyncio.Semaphore(getattr(self.config, "max_concurrency", DEFAULT_MAX_CONCURRENCY))
+            
+            async def guarded(coro):
+                async with semaphore:
+                    return await coro
+            
+            results: List[Optional[ContractResult]] = [None] * len(contract_ids)
+            chunk_size = max(1, getattr(self.config, "strategy_chunk_size", DEFAULT_STRATEGY_CHUNK_SIZE))
+            
+            # Decide on worker processes from the whole run, not per chunk, so
+            # large runs use them even though each chunk is small
+            parallel = len(contract_ids) >= PARALLEL_ANALYSIS_MIN_CONTRACTS
+            
+            # Pipeline: the producer fetches the next chunk of contracts while
+            # earlier chunks are being analyzed and traded
+            chunks: asyncio.Queue = asyncio.Queue(maxsize=2)
+            
+            async def produce():
                 try:
-                    # Get contract
-                    contract = await self.get_contract(contract_id)
+                    for start in range(0, len(contract_ids), chunk_size):
+                        chunk_ids = contract_ids[start:start + chunk_size]
+                        fetched = await self.kalshi_collector.get_contracts_batch(chunk_ids, return_exceptions=True)
+                        await chunks.put((start, chunk_ids, fetched))
+                except Exception:
+                    # Wake the consumer; it re-raises the error from awaiting the producer
+                    await chunks.put(None)
+                    raise
+                await chunks.put(None)
+            
+            producer = asyncio.create_task(produce())
+            pending = []
+            tasks = []
+            try:
+                while (chunk := await chunks.get()) is not None:
+                    start, chunk_ids, fetched = chunk
                     
-                    # Analyze contract
-                    analysis = await self.analyze_contract(contract)
+                    chunk_pending = []
+                    for offset, (contract_id, contract) in enumerate(zip(chunk_ids, fetched)):
+                        if isinstance(contract, Exception):
+                            results[start + offset] = self._error_result(contract_id, contract)
+                        else:
+                            chunk_pending.append((start + offset, contract_id, contract))
                     
-                    # Generate signal
-                    signal = await self.generate_signal(analysis)
+                    # Statistical analysis for the chunk in one vectorized pass
+                    statistical_analyses = await self._analyze_contracts_batch(
+                        [contract for _, _, contract in chunk_pending],
+                        parallel=parallel
+                    )
                     
-                    # Execute trade if signal is strong enough
-                    if signal.get("confidence", 0) >= self.config.min_confidence_threshold:
-                        execution = await self.execute_trade(signal)
-                        results.append({
-                            "contract_id": contract_id,
-                            "analysis": analysis,
-                            "signal": signal,
-                            "execution": execution,
-                        })
-                    else:
-                        results.append({
-                            "contract_id": contract_id,
-                            "analysis": analysis,
-                            "signal": signal,
-                            "execution": {"status": "SKIPPED", "reason": "Low confidence"},
-                        })
-                        
-                except Exception as e:
-                    logger.error(f"Failed to process contract {contract_id}: {e}")
-                    results.append({
-                        "contract_id": contract_id,
-                        "error": str(e),
-                    })
+                    # Analyze, signal and trade each contract concurrently
+                    for (index, contract_id, contract), statistical_analysis in zip(chunk_pending, statistical_analyses):
+                        pending.append((index, contract_id))
+                        tasks.append(asyncio.create_task(
+                            guarded(self._process_one(contract_id, contract, statistical_analysis))
+                        ))
+                
+                await producer
+            except Exception:
+                # Let contracts already in flight finish before propagating
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+            finally:
+                if not producer.done():
+                    producer.cancel()
+            
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            
+            for (index, contract_id), outcome in zip(pending, outcomes):
+                if isinstance(outcome, Exception):
+                    results[index] = self._error_result(contract_id, outcome)
+                else:
+                    results[index] = outcome
             
             logger.info(f"Strategy completed for {len(contract_ids)} contracts")
-            return {"results": results, "total_contracts": len(contract_ids)}
+            return {
+                "results": [result.to_dict() for result in results],
+                "total_contracts": len(contract_ids)
+            }
             
         except Exception as e:
             logger.error(f"Failed to run strategy: {e}")
             raise
     
+    async def _process_one(self, contract_id: str, contract: Dict[str, Any],
+                           statistical_analysis: Dict[str, Any]) -> ContractResult:
+        """
+        Analyze, signal and (if warranted) trade a single fetched contract
+        
+        Args:
+            contract_id: The Kalshi contract ID
+            contract: Contract information dictionary
+            statistical_analysis: Precomputed ensemble analysis
+            
+        Returns:
+            Per-contract strategy result
+        """
+        # Analyze contract
+        analysis = await self.analyze_contract(contract, statistical_analysis=statistical_analysis)
+        
+        # Risk checks and position updates must see each trade in turn, so
+        # signal generation and execution are serialized across contracts
+        async with self._trade_lock:
+            # Generate signal
+            signal = await self.generate_signal(analysis)
+            
+            # Execute trade if signal is strong enough
+            if signal.get("confidence", 0) >= self.config.min_confidence_threshold:
+                execution = await self.execute_trade(signal)
+            else:
+                execution = {"status": "SKIPPED", "reason": "Low confidence"}
+        
+        return ContractResult(contract_id, analysis, signal, execution)
+    
+    @staticmethod
+    def _error_result(contract_id: str, error: Exception) -> ContractResult:
+        """Log a per-contract failure and build its result entry"""
+        logger.error(f"Failed to process contract {contract_id}: {error}")
+        return ContractResult(contract_id, error=str(error))
+    
+    async def _analyze_contracts_batch(self, contracts: List[Dict[str, Any]],
+                                       parallel: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Run the ensemble batch analysis, spreading large batches over worker processes
+        
+        Args:
+            contracts: List of contract information dictionaries
+            parallel: Whether to use worker processes; by default only for
+                batches of at least PARALLEL_ANALYSIS_MIN_CONTRACTS
+            
+        Returns:
+            List of ensemble analysis dictionaries, in input order
+        """
+        if parallel is None:
+            parallel = len(contracts) >= PARALLEL_ANALYSIS_MIN_CONTRACTS
+        
+        workers = getattr(self.config, "analysis_workers", None) or os.cpu_count() or 1
+        if workers <= 1 or not parallel or not contracts:
+            return await self._analyze_contracts_batch_in_thread(contracts)
+        
+        try:
+            if self._process_pool is None:
+                # spawn, not fork: forking after the Numba kernel's thread pool
+                # has started leaves the workers deadlocked
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_analysis_worker,
+                    initargs=(self.config,)
+                )
+            
+            # One contiguous chunk per worker keeps the batch kernel vectorized
+            chunk_size = -(-len(contracts) // workers)
+            loop = asyncio.get_running_loop()
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(
+                    self._process_pool, analyze_contracts_chunk, contracts[start:start + chunk_size]
+                )
+                for start in range(0, len(contracts), chunk_size)
+            ))
+            return [analysis for chunk in chunks for analysis in chunk]
+            
+        except Exception as e:
+            logger.warning(f"Parallel analysis failed, analyzing in-process: {e}")
+            return await self._analyze_contracts_batch_in_thread(contracts)
+    
+    async def _analyze_contracts_batch_in_thread(self, contracts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run the ensemble batch analysis on the analysis thread"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._analysis_executor, self.ensemble_model.analyze_contracts_batch_sync, contracts
+        )
+    
     async def get_portfolio_status(self) -> Dict[str, Any]:
         """
         Get current portfolio status and performance
@@ -256,12 +514,13 @@ class KalshiHedgeFund:
         """
         try:
             portfolio = await self.kalshi_trader.get_portfolio()
+            await self._wait_for_position_updates()
             risk_metrics = await self.exposure_monitor.get_risk_metrics()
             
             return {
                 "portfolio": portfolio,
                 "risk_metrics": risk_metrics,
-                "timestamp": asyncio.get_event_loop().time(),
+                "timestamp": self._now(),
             }
         except Exception as e:
             logger.error(f"Failed to get portfolio status: {e}")
@@ -272,9 +531,19 @@ class KalshiHedgeFund:
         try:
             logger.info("Shutting down Kalshi AI Hedge Fund Framework")
             
-            # Close connections and cleanup
-            await self.kalshi_collector.close()
+            # Let pending position updates land
+            await self._wait_for_position_updates()
+            
+            # Close connections and cleanup; the collector goes last since the
+            # trader still makes API requests while cancelling open orders
             await self.kalshi_trader.close()
+            await self.llm_engine.close()
+            await self.kalshi_collector.close()
+            
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+            self._analysis_executor.shutdown()
             
             logger.info("Framework shutdown completed")
             
@@ -7,7 +7,9 @@ market data, contract information, and trading data.
 
 import aiohttp
 import asyncio
-from typing import Dict, Any, List, Optional
+import random
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 try:
@@ -16,6 +18,29 @@ except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
+from ...utils.serialization import loads_json
+
+
+# Request usage records are logged in batches of this size, or after this
+# many seconds, whichever comes first
+USAGE_FLUSH_SIZE = 50
+USAGE_FLUSH_INTERVAL = 5.0  # seconds
+
+# Contract listing pagination
+CONTRACTS_PAGE_SIZE = 100
+SEARCH_SCAN_LIMIT = 1000  # contracts examined per search
+
+# Cached contract listings and listing pages kept (oldest evicted first)
+CONTRACTS_CACHE_SIZE = 256
+PAGES_CACHE_SIZE = 1024
+
+# Methods that are safe to resend after a timeout or server error; others are
+# only retried when the server rejected them outright (429)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Queued after the last usage record to stop the flusher
+_USAGE_STOP = None
+
 
 class KalshiAPICollector:
     """
@@ -40,33 +65,80 @@ class KalshiAPICollector:
         # Session for HTTP requests
         self.session = None
         
-        # Rate limiting
+        # Rate limiting: token bucket refilled every rate_limit_delay seconds,
+        # holding up to rate_limit_burst tokens
         self.request_count = 0
-        self.last_request_time = None
         self.rate_limit_delay = 0.1  # 100ms between requests
+        self.rate_limit_burst = getattr(config, "kalshi_rate_limit_burst", 1)
+        self._next_slot = 0.0
+        
+        # Bounds concurrent in-flight requests (and pooled connections)
+        self.max_concurrent = getattr(config, "kalshi_max_concurrent", 10)
+        self._request_semaphore = asyncio.Semaphore(self.max_concurrent)
+        
+        # Short-lived cache of contract listings, keyed by query parameters
+        self.contracts_ttl = getattr(config, "contracts_ttl", 30.0)  # seconds
+        self._contracts_cache: Dict[tuple, Tuple[float, List[Dict[str, Any]]]] = {}
+        
+        # Cached listing pages, keyed by query parameters and cursor; each entry
+        # is [fetched_at, contracts, next_cursor, lowercased search texts]
+        self._pages_cache: Dict[tuple, List[Any]] = {}
+        
+        # Retries with exponential backoff and jitter
+        self.max_retries = getattr(config, "kalshi_max_retries", 3)
+        self.retry_backoff_base = 0.5  # seconds
+        self.retry_backoff_cap = 10.0  # seconds
+        
+        # Usage records (method, latency, success), flushed by a background task
+        self._usage_queue: asyncio.Queue = asyncio.Queue()
+        self._usage_flusher: Optional[asyncio.Task] = None
+        self._closed = False
         
         logger.info("Kalshi API Collector initialized")
     
+    async def warmup(self):
+        """
+        Open the HTTP session and establish a pooled connection ahead of the
+        first real request, so it does not pay the TCP/TLS handshake
+        """
+        await self._get_session()
+        try:
+            await self._make_request("GET", "/user/balance")
+            logger.info("Kalshi API connection warmed up")
+        except Exception as e:
+            logger.warning(f"Kalshi API warmup request failed: {e}")
+    
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create HTTP session"""
         if self.session is None or self.session.closed:
+            # All traffic goes to one host: pool as many keep-alive connections
+            # as there can be in-flight requests and cache its DNS lookup
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrent,
+                limit_per_host=self.max_concurrent,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
+            )
+            # Content-Type is set per request by aiohttp when a JSON body is sent
             self.session = aiohttp.ClientSession(
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                }
+                connector=connector,
+                headers={"Authorization": f"Bearer {self.api_key}"}
             )
         return self.session
     
     async def _rate_limit(self):
         """Implement rate limiting"""
-        if self.last_request_time:
-            elapsed = (datetime.now() - self.last_request_time).total_seconds()
-            if elapsed < self.rate_limit_delay:
-                await asyncio.sleep(self.rate_limit_delay - elapsed)
-        
-        self.last_request_time = datetime.now()
+        # Reserve a start slot before sleeping so concurrent callers queue up
+        # behind each other instead of all waking at once
+        now = time.monotonic()
+        slot = max(self._next_slot, now)
+        start = max(now, slot - (self.rate_limit_burst - 1) * self.rate_limit_delay)
+        self._next_slot = slot + self.rate_limit_delay
         self.request_count += 1
+        
+        if start > now:
+            await asyncio.sleep(start - now)
     
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
@@ -80,25 +152,126 @@ class KalshiAPICollector:
         Returns:
             API response data
         """
-        await self._rate_limit()
-        
         session = await self._get_session()
         url = f"{self.base_url}{endpoint}"
         
-        try:
-            async with session.request(method, url, **kwargs) as response:
-                response.raise_for_status()
-                data = await response.json()
+        attempt = 0
+        while True:
+            try:
+                async with self._request_semaphore:
+                    await self._rate_limit()
+                    started = time.monotonic()
+                    async with session.request(method, url, **kwargs) as response:
+                        response.raise_for_status()
+                        data = await response.json(loads=loads_json)
                 
-                logger.debug(f"API request successful: {method} {endpoint}")
+                self._record_usage(method, time.monotonic() - started, True)
                 return data
+                    
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._record_usage(method, 0.0, False)
                 
-        except aiohttp.ClientError as e:
-            logger.error(f"API request failed: {method} {endpoint} - {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error in API request: {e}")
-            raise
+                delay = self._retry_delay(method, e, attempt)
+                if delay is None:
+                    logger.error(f"API request failed: {method} {endpoint} - {e}")
+                    raise
+                
+                attempt += 1
+                logger.warning(
+                    f"API request failed: {method} {endpoint} - {e}; "
+                    f"retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error(f"Unexpected error in API request: {e}")
+                raise
+    
+    def _retry_delay(self, method: str, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retrying a failed request
+        
+        Args:
+            method: HTTP method of the failed request
+            error: Error raised by the request
+            attempt: Number of retries already made
+            
+        Returns:
+            Delay in seconds, or None if the request should not be retried
+        """
+        if attempt >= self.max_retries:
+            return None
+        
+        status = error.status if isinstance(error, aiohttp.ClientResponseError) else None
+        if status == 429:
+            # Honor the server's requested wait when given in seconds
+            retry_after = (error.headers or {}).get("Retry-After")
+            try:
+                return float(retry_after)
+            except (TypeError, ValueError):
+                pass
+        elif method.upper() not in IDEMPOTENT_METHODS:
+            return None
+        elif status is not None and status < 500:
+            return None
+        
+        backoff = min(self.retry_backoff_cap, self.retry_backoff_base * 2 ** attempt)
+        return backoff * random.uniform(0.5, 1.5)
+    
+    def _record_usage(self, method: str, latency: float, success: bool):
+        """Queue a usage record, starting the background flusher on first use"""
+        if self._closed:
+            # The flusher has stopped for good; log late records directly
+            self._log_usage([(method, latency, success)])
+            return
+        
+        if self._usage_flusher is None or self._usage_flusher.done():
+            self._usage_flusher = asyncio.create_task(self._flush_usage_loop())
+        self._usage_queue.put_nowait((method, latency, success))
+    
+    async def _flush_usage_loop(self):
+        """Log queued usage records in batches until the stop sentinel arrives"""
+        while True:
+            record = await self._usage_queue.get()
+            if record is _USAGE_STOP:
+                return
+            
+            batch = [record]
+            deadline = time.monotonic() + USAGE_FLUSH_INTERVAL
+            
+            while len(batch) < USAGE_FLUSH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self._usage_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if record is _USAGE_STOP:
+                    # Flush what is left before stopping
+                    self._log_usage(batch)
+                    return
+                batch.append(record)
+            
+            self._log_usage(batch)
+    
+    @staticmethod
+    def _log_usage(batch: List[Tuple[str, float, bool]]):
+        """Emit one aggregated log record for a batch of usage records"""
+        methods: Dict[str, int] = {}
+        failed = 0
+        latencies = []
+        for method, latency, success in batch:
+            methods[method] = methods.get(method, 0) + 1
+            if success:
+                latencies.append(latency)
+            else:
+                failed += 1
+        
+        mean_latency = 1000 * sum(latencies) / len(latencies) if latencies else 0.0
+        logger.debug(
+            f"API usage: {len(batch)} requests {methods}, {failed} failed, "
+            f"mean latency {mean_latency:.1f} ms"
+        )
     
     async def get_contract(self, contract_id: str) -> Dict[str, Any]:
         """
@@ -113,25 +286,114 @@ class KalshiAPICollector:
         endpoint = f"/contracts/{contract_id}"
         return await self._make_request("GET", endpoint)
     
+    async def get_contracts_batch(self, contract_ids: List[str],
+                                  return_exceptions: bool = False) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Get information for many contracts concurrently
+        
+        Requests share the collector's keep-alive session; concurrency and
+        pacing are bounded by the collector's rate limiter.
+        
+        Args:
+            contract_ids: List of Kalshi contract IDs
+            return_exceptions: Return failed lookups as exceptions in place
+                instead of raising the first failure
+            
+        Returns:
+            List of contract information dictionaries, in input order
+        """
+        return await asyncio.gather(
+            *(self.get_contract(contract_id) for contract_id in contract_ids),
+            return_exceptions=return_exceptions
+        )
+    
     async def get_contracts(self, series_id: Optional[str] = None, 
-                          limit: int = 100) -> List[Dict[str, Any]]:
+                          limit: int = 100, **filters) -> List[Dict[str, Any]]:
         """
         Get list of contracts
         
+        Listings are cached for self.contracts_ttl seconds (the CONTRACTS_TTL
+        setting) per set of query parameters.
+        
         Args:
             series_id: Optional series ID to filter by
             limit: Maximum number of contracts to return
+            **filters: Additional API query filters (e.g. status="active")
             
         Returns:
             List of contract dictionaries
         """
-        params: Dict[str, Any] = {"limit": limit}
+        return list(await self._fetch_contracts(series_id, limit, **filters))
+    
+    async def _fetch_contracts(self, series_id: Optional[str], limit: int,
+                               **filters) -> List[Dict[str, Any]]:
+        """Get the (shared, cached) contract listing for a set of query parameters"""
+        key = (series_id, limit, tuple(sorted(filters.items())))
+        cached = self._contracts_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.contracts_ttl:
+            return cached[1]
+        
+        params: Dict[str, Any] = {"limit": limit, **filters}
         if series_id:
             params["series_id"] = series_id
         
         endpoint = "/contracts"
         response = await self._make_request("GET", endpoint, params=params)
-        return response.get("contracts", [])
+        contracts = response.get("contracts", [])
+        
+        _cache_put(self._contracts_cache, key, (time.monotonic(), contracts), CONTRACTS_CACHE_SIZE)
+        return contracts
+    
+    async def iter_contracts(self, series_id: Optional[str] = None,
+                             page_size: int = CONTRACTS_PAGE_SIZE, **filters) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over contracts one page at a time
+        
+        Pages are fetched on demand, so stopping early skips the remaining
+        requests. Pages are cached for self.contracts_ttl seconds.
+        
+        Args:
+            series_id: Optional series ID to filter by
+            page_size: Number of contracts requested per page
+            **filters: Additional API query filters (e.g. status="active")
+            
+        Yields:
+            Contract dictionaries
+        """
+        async for page in self._iter_contract_pages(series_id, page_size, **filters):
+            for contract in page[1]:
+                yield contract
+    
+    async def _iter_contract_pages(self, series_id: Optional[str], page_size: int,
+                                   **filters) -> AsyncIterator[List[Any]]:
+        """Iterate over (cached) contract listing page entries"""
+        base_key = (series_id, page_size, tuple(sorted(filters.items())))
+        cursor = None
+        
+        while True:
+            key = base_key + (cursor,)
+            page = self._pages_cache.get(key)
+            if page is None or time.monotonic() - page[0] >= self.contracts_ttl:
+                params: Dict[str, Any] = {"limit": page_size, **filters}
+                if series_id:
+                    params["series_id"] = series_id
+                if cursor:
+                    params["cursor"] = cursor
+                
+                response = await self._make_request("GET", "/contracts", params=params)
+                page = [
+                    time.monotonic(),
+                    response.get("contracts", []),
+                    response.get("next_cursor") or response.get("cursor"),
+                    None
+                ]
+                _cache_put(self._pages_cache, key, page, PAGES_CACHE_SIZE)
+            
+            yield page
+            
+            cursor = page[2]
+            if not cursor or not page[1]:
+                break
     
     async def get_market_history(self, contract_id: str, 
                                start_time: Optional[datetime] = None,
@@ -250,19 +512,29 @@ class KalshiAPICollector:
         # In practice, you might need to implement this differently
         # based on the actual Kalshi API capabilities
         
-        all_contracts = await self.get_contracts(limit=1000)
+        query_lower = query.lower()
         matching_contracts = []
+        scanned = 0
         
-        query_lower = query.lower()
-        for contract in all_contracts:
-            title = contract.get("title", "").lower()
-            description = contract.get("description", "").lower()
+        # Stream pages and stop as soon as enough matches are found
+        async for page in self._iter_contract_pages(None, CONTRACTS_PAGE_SIZE):
+            # Lowercase each cached page once, not on every search; the NUL
+            # separator keeps a query from matching across title and description
+            if page[3] is None:
+                page[3] = [
+                    f"{contract.get('title', '')}\0{contract.get('description', '')}".lower()
+                    for contract in page[1]
+                ]
             
-            if query_lower in title or query_lower in description:
-                matching_contracts.append(contract)
+            for contract, text in zip(page[1], page[3]):
+                if scanned >= SEARCH_SCAN_LIMIT:
+                    return matching_contracts
+                scanned += 1
                 
-                if len(matching_contracts) >= limit:
-                    break
+                if query_lower in text:
+                    matching_contracts.append(contract)
+                    if len(matching_contracts) >= limit:
+                        return matching_contracts
         
         return matching_contracts
     
@@ -273,18 +545,28 @@ class KalshiAPICollector:
         Returns:
             List of active contract dictionaries
         """
-        all_contracts = await self.get_contracts(limit=1000)
-        active_contracts = []
-        
-        for contract in all_contracts:
-            status = contract.get("status", "")
-            if status.lower() == "active":
-                active_contracts.append(contract)
-        
-        return active_contracts
+        # Filter server-side; the status check guards against an API that
+        # ignores the filter
+        contracts = await self.get_contracts(limit=1000, status="active")
+        return [contract for contract in contracts if contract.get("status", "").lower() == "active"]
     
     async def close(self):
         """Close the HTTP session"""
+        # Stop the flusher with a sentinel rather than cancelling it: on Python
+        # 3.11 a cancel that lands inside wait_for() can be swallowed
+        self._closed = True
+        if self._usage_flusher is not None and not self._usage_flusher.done():
+            self._usage_queue.put_nowait(_USAGE_STOP)
+            await self._usage_flusher
+        
         if self.session and not self.session.closed:
             await self.session.close()
-            logger.info("Kalshi API Collector session closed")
\ No newline at end of file
+            logger.info("Kalshi API Collector session closed")
+
+
+def _cache_put(cache: Dict[Any, Any], key: Any, value: Any, max_size: int):
+    """Insert into an insertion-ordered cache, evicting the oldest entry when full"""
+    cache.pop(key, None)
+    if len(cache) >= max_size:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
\ No newline at end of file
@@ -2,6 +2,8 @@
 LLM Agent modules for research and reasoning
 """
 
+from .rate_limiter import RateLimiter
 from .reasoning_engine import LLMReasoningEngine
+from .semantic_cache import SemanticCache
 
-__all__ = ["LLMReasoningEngine"]
\ No newline at end of file
+__all__ = ["LLMReasoningEngine", "RateLimiter", "SemanticCache"]
\ No newline at end of file
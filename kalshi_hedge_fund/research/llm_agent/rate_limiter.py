@@ -0,0 +1,102 @@
+"""
+Client-side Rate Limiter for LLM Requests
+
+This module throttles LLM requests to stay within the provider's
+requests-per-minute and tokens-per-minute quotas, so that batch workloads
+are paced locally instead of being rejected with 429 responses.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+# Length of the sliding window the quotas apply to
+RATE_LIMIT_WINDOW = 60.0  # seconds
+
+
+class RateLimiter:
+    """
+    Sliding-window limiter for requests and tokens per minute
+    
+    Each acquire() records one request and its estimated token count, waiting
+    first until both fit within the quotas over the last minute. Waiters are
+    served in arrival order. A limit of None disables that quota.
+    """
+    
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            rpm: Maximum requests per minute
+            tpm: Maximum tokens per minute
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        
+        self._req_times: deque = deque()
+        self._tok_times: deque = deque()  # (timestamp, tokens)
+        self._tok_total = 0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, tokens: int = 0):
+        """
+        Wait until a request of the given size fits within the quotas
+        
+        Args:
+            tokens: Estimated tokens consumed by the request
+        """
+        if self.rpm is None and self.tpm is None:
+            return
+        
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._evict(now)
+                
+                wait = self._wait_time(now, tokens)
+                if wait <= 0:
+                    break
+                
+                logger.debug(f"LLM rate limit reached, waiting {wait:.2f}s")
+                await asyncio.sleep(wait)
+            
+            self._req_times.append(now)
+            if tokens:
+                self._tok_times.append((now, tokens))
+                self._tok_total += tokens
+    
+    def _evict(self, now: float):
+        """Drop records that have left the window"""
+        cutoff = now - RATE_LIMIT_WINDOW
+        while self._req_times and self._req_times[0] <= cutoff:
+            self._req_times.popleft()
+        while self._tok_times and self._tok_times[0][0] <= cutoff:
+            self._tok_total -= self._tok_times.popleft()[1]
+    
+    def _wait_time(self, now: float, tokens: int) -> float:
+        """Seconds until a request of the given size fits, or 0 if it does now"""
+        wait = 0.0
+        
+        if self.rpm is not None and len(self._req_times) >= self.rpm:
+            wait = self._req_times[0] + RATE_LIMIT_WINDOW - now
+        
+        if self.tpm is not None and self._tok_times:
+            # Wait for the oldest records to expire until the request fits; a
+            # request larger than the whole quota goes once the window is empty
+            excess = self._tok_total + tokens - self.tpm
+            for timestamp, count in self._tok_times:
+                if excess <= 0:
+                    break
+                excess -= count
+                wait = max(wait, timestamp + RATE_LIMIT_WINDOW - now)
+        
+        return wait
\ No newline at end of file
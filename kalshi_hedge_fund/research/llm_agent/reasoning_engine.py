@@ -6,7 +6,11 @@ Kalshi event contracts and generating trading insights.
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
+import hashlib
+import random
+import re
+import time
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional, Tuple
 import json
 
 try:
@@ -14,12 +18,144 @@ try:
 except ImportError:
     openai = None
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 try:
     from loguru import logger
 except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
+from ...utils.serialization import dumps_json, loads_json
+from .rate_limiter import RateLimiter
+from .semantic_cache import SemanticCache
+
+
+# Matches one component of an OpenAI rate limit reset duration ("6m0s", "20ms")
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+# Completion token budget per LLM request
+LLM_MAX_TOKENS = 2000
+
+# OpenAI Batch API jobs (half price, completed within the window)
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INTERVAL = 60.0  # seconds
+BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Parsed LLM responses are cached per prompt; fact checks go stale fastest
+RESPONSE_CACHE_SIZE = 2048
+RESPONSE_CACHE_TTLS = {
+    "event_analysis": 3600.0,  # seconds
+    "research_planning": 6 * 3600.0,
+    "fact_checking": 600.0,
+}
+
+# Number of contract_info strings memoized across analysis types
+CONTRACT_INFO_CACHE_SIZE = 1024
+
+# Analysis types whose responses are requested in OpenAI JSON mode
+JSON_RESPONSE_KINDS = frozenset({"event_analysis", "research_planning"})
+
+# Models that accept response_format={"type": "json_object"}; the original
+# gpt-4 and gpt-4-32k snapshots reject it with a 400
+JSON_MODE_MODEL_PREFIXES = (
+    "gpt-3.5-turbo-1106", "gpt-3.5-turbo-0125", "gpt-4-turbo", "gpt-4-1106",
+    "gpt-4-0125", "gpt-4o", "gpt-4.1", "gpt-5", "o3", "o4"
+)
+
+# User prompt templates, filled with str.format
+ANALYSIS_PROMPT_TEMPLATE = """\
+Please analyze the Kalshi event contract given at the end.
+
+Provide a comprehensive analysis including:
+1. Probability assessment for each outcome
+2. Key factors that could influence the result
+3. Market sentiment analysis
+4. Risk factors and uncertainties
+5. Trading recommendations with confidence levels
+6. Timeline considerations
+7. Related events or correlations to monitor
+
+Format your response as JSON with the following structure:
+{{
+    "probability_assessment": {{
+        "outcome_1": {{"probability": 0.0, "confidence": 0.0, "reasoning": ""}},
+        "outcome_2": {{"probability": 0.0, "confidence": 0.0, "reasoning": ""}}
+    }},
+    "key_factors": ["factor1", "factor2"],
+    "market_sentiment": "bullish/bearish/neutral",
+    "risk_factors": ["risk1", "risk2"],
+    "trading_recommendations": [
+        {{
+            "action": "BUY/SELL/HOLD",
+            "outcome": "outcome_name",
+            "confidence": 0.0,
+            "reasoning": ""
+        }}
+    ],
+    "timeline_considerations": "text",
+    "related_events": ["event1", "event2"]
+}}
+
+Contract:
+{contract_info}
+"""
+
+RESEARCH_PROMPT_TEMPLATE = """\
+Create a research plan for the event contract given at the end.
+
+Provide a structured research plan including:
+1. Key information needs
+2. Data sources to investigate
+3. Timeline for research
+4. Priority research tasks
+5. Success metrics
+
+Format your response as JSON with the following structure:
+{{
+    "information_needs": ["need1", "need2"],
+    "data_sources": ["source1", "source2"],
+    "timeline": {{
+        "immediate": ["task1", "task2"],
+        "short_term": ["task1", "task2"],
+        "ongoing": ["task1", "task2"]
+    }},
+    "priority_tasks": ["task1", "task2"],
+    "success_metrics": ["metric1", "metric2"]
+}}
+
+Contract:
+{contract_info}
+"""
+
+FACT_CHECK_PROMPT_TEMPLATE = """\
+Please fact-check the information below and provide:
+1. Credibility assessment
+2. Confidence score (0-1)
+3. Reasoning
+4. Potential biases or issues
+5. Recommendations
+
+Information to fact-check: {information}
+
+Event context: {context}
+"""
+
 
 class LLMReasoningEngine:
     """
@@ -39,14 +175,59 @@ class LLMReasoningEngine:
         self.config = config
         self.model = config.llm_model
         
+        # Request JSON mode only from models that support it, unless forced
+        # on or off with LLM_JSON_MODE; prompts ask for JSON either way
+        json_mode = getattr(config, "llm_json_mode", None)
+        self.json_mode = self.model.startswith(JSON_MODE_MODEL_PREFIXES) if json_mode is None else bool(json_mode)
+        
         if openai is None:
             logger.warning("OpenAI library not available. LLM features will be disabled.")
             self.client = None
         else:
+            # Retries are handled in _get_llm_response
             self.client = openai.AsyncOpenAI(
                 api_key=config.openai_api_key,
-                organization=config.openai_organization
+                organization=config.openai_organization,
+                max_retries=0,
+                http_client=self._create_http_client()
+            )
+        
+        # Bounds concurrent LLM requests
+        self._llm_semaphore = asyncio.Semaphore(getattr(config, "openai_max_concurrency", 10))
+        
+        # Retries of rate-limited, timed-out or 5xx LLM requests, with
+        # exponential backoff and jitter
+        self.max_retries = getattr(config, "openai_max_retries", 5)
+        self.retry_backoff_base = 1.0  # seconds
+        self.retry_backoff_cap = 30.0  # seconds
+        # Overall time budget for one request across all of its retries
+        self.request_deadline = getattr(config, "openai_request_deadline", 120.0)
+        
+        # Client-side requests/tokens per minute quotas
+        self.rate_limiter = RateLimiter(
+            rpm=getattr(config, "openai_rpm_limit", None),
+            tpm=getattr(config, "openai_tpm_limit", None)
+        )
+        self._encoding = self._load_encoding()
+        
+        # Parsed responses keyed by sha256 of model and prompts, and per-key
+        # locks so concurrent identical requests make a single LLM call
+        self._response_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._response_locks: Dict[str, asyncio.Lock] = {}
+        
+        # Prompt-ready contract descriptions, keyed by contract id and
+        # versioned by (updated_at, current_price)
+        self._info_cache: Dict[Any, Tuple[tuple, str]] = {}
+        
+        # Reuse analyses of contracts with near-identical text and the same price
+        if getattr(config, "llm_semantic_cache", False):
+            self.semantic_cache = SemanticCache(
+                threshold=getattr(config, "llm_cache_threshold", 0.85),
+                max_entries=getattr(config, "llm_cache_size", 1000),
+                ttl=getattr(config, "llm_cache_ttl", RESPONSE_CACHE_TTLS["event_analysis"])
             )
+        else:
+            self.semantic_cache = None
         
         # System prompts for different analysis types
         self.system_prompts = {
@@ -58,7 +239,8 @@ class LLMReasoningEngine:
             4. Risk factors and uncertainties
             5. Trading recommendations
             
-            Be objective, data-driven, and consider multiple scenarios.""",
+            Be objective, data-driven, and consider multiple scenarios.
+            Respond with a single JSON object.""",
             
             "research_planning": """You are a research strategist for a quantitative hedge fund.
             Given an event contract, create a comprehensive research plan that includes:
@@ -68,7 +250,8 @@ class LLMReasoningEngine:
             4. Priority research tasks
             5. Success metrics
             
-            Focus on actionable insights that can inform trading decisions.""",
+            Focus on actionable insights that can inform trading decisions.
+            Respond with a single JSON object.""",
             
             "fact_checking": """You are a fact-checking specialist for financial markets.
             Verify the accuracy and reliability of information related to the event contract.
@@ -82,8 +265,43 @@ class LLMReasoningEngine:
             Provide a confidence score and reasoning for your assessment."""
         }
         
+        # Token counts of the fixed system prompts, so only the variable user
+        # prompt is tokenized per request
+        self._system_token_counts = {
+            prompt: self._count_tokens(prompt) for prompt in self.system_prompts.values()
+        }
+        
         logger.info("LLM Reasoning Engine initialized")
     
+    def _create_http_client(self):
+        """
+        Create a pooled HTTP client for the OpenAI API
+        
+        Keeps enough connections alive for openai_max_concurrency requests and
+        multiplexes them over HTTP/2 when the h2 package is installed.
+        
+        Returns:
+            httpx.AsyncClient, or None to use the OpenAI library default
+        """
+        if httpx is None:
+            return None
+        
+        max_connections = getattr(self.config, "openai_max_connections", 100)
+        read_timeout = getattr(self.config, "openai_read_timeout", 30.0)
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(read_timeout, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max(1, max_connections // 2)
+            )
+        )
+    
+    async def close(self):
+        """Close the LLM client and its connection pool"""
+        if self.client is not None:
+            await self.client.close()
+    
     async def analyze_event(self, contract: Dict[str, Any]) -> Dict[str, Any]:
         """
         Perform comprehensive LLM analysis of an event contract
@@ -98,6 +316,14 @@ class LLMReasoningEngine:
             return self._fallback_analysis(contract)
         
         try:
+            # Check for an analysis of a semantically equivalent contract
+            if self.semantic_cache is not None:
+                cache_text, cache_version = self._semantic_cache_key(contract)
+                cached = await self.semantic_cache.get(self.model, cache_text, cache_version)
+                if cached is not None:
+                    logger.info(f"Reusing cached LLM analysis for contract: {contract.get('id', 'unknown')}")
+                    return {**cached, "contract_id": contract.get("id")}
+            
             logger.info(f"Starting LLM analysis for contract: {contract.get('id', 'unknown')}")
             
             # Extract contract information
@@ -106,14 +332,16 @@ class LLMReasoningEngine:
             # Generate analysis prompt
             prompt = self._create_analysis_prompt(contract_info)
             
-            # Get LLM response
-            response = await self._get_llm_response(
-                prompt, 
-                system_prompt=self.system_prompts["event_analysis"]
+            # Get and parse the LLM response
+            analysis = await self._get_parsed_response(
+                "event_analysis",
+                prompt,
+                lambda response: self._parse_analysis_response(response, contract)
             )
+            analysis = {**analysis, "contract_id": contract.get("id")}
             
-            # Parse and structure the response
-            analysis = self._parse_analysis_response(response, contract)
+            if self.semantic_cache is not None:
+                await self.semantic_cache.put(self.model, cache_text, analysis, cache_version)
             
             logger.info(f"LLM analysis completed for contract: {contract.get('id', 'unknown')}")
             return analysis
@@ -122,6 +350,94 @@ class LLMReasoningEngine:
             logger.error(f"LLM analysis failed: {e}")
             return self._fallback_analysis(contract)
     
+    @staticmethod
+    def _semantic_cache_key(contract: Dict[str, Any]) -> Tuple[str, tuple]:
+        """
+        Semantic cache text and version for a contract
+        
+        Near-duplicate contracts only share an analysis when their price and
+        outcomes match exactly, so a hit never carries another contract's
+        probabilities for a different market state.
+        """
+        text = f"{contract.get('title', '')}\n{contract.get('description', '')}"
+        return text, (contract.get("current_price"), repr(contract.get("outcomes")))
+    
+    async def analyze_event_stream(self, contract: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Perform LLM analysis of an event contract, yielding partial results
+        
+        The response is streamed, and each time another top-level member of
+        the analysis JSON completes, a partial result is yielded so callers
+        can act on e.g. the probability assessment before the rest arrives.
+        
+        Args:
+            contract: Contract information dictionary
+            
+        Yields:
+            Analysis results dictionaries shaped like analyze_event's, with
+            "partial": True on all but the last, complete one
+        """
+        if self.client is None:
+            yield self._fallback_analysis(contract)
+            return
+        
+        try:
+            if self.semantic_cache is not None:
+                cache_text, cache_version = self._semantic_cache_key(contract)
+                cached = await self.semantic_cache.get(self.model, cache_text, cache_version)
+                if cached is not None:
+                    yield {**cached, "contract_id": contract.get("id")}
+                    return
+            
+            prompt = self._create_analysis_prompt(self._extract_contract_info(contract))
+            system_prompt = self.system_prompts["event_analysis"]
+            key = self._response_cache_key(system_prompt, prompt)
+            
+            cached = self._cached_response(key, "event_analysis")
+            if cached is not None:
+                yield {**cached, "contract_id": contract.get("id")}
+                return
+            
+            parser = _StreamingObjectParser()
+            async for text in self._stream_llm_response(
+                prompt,
+                system_prompt=system_prompt,
+                response_format={"type": "json_object"}
+            ):
+                if parser.feed(text):
+                    members = parser.members()
+                    if members is not None:
+                        yield {
+                            "contract_id": contract.get("id"),
+                            "analysis": members,
+                            "timestamp": time.monotonic(),
+                            "model": self.model,
+                            "partial": True
+                        }
+            
+            analysis = self._parse_analysis_response(parser.buffer, contract)
+            self._store_response(key, analysis)
+            if self.semantic_cache is not None:
+                await self.semantic_cache.put(self.model, cache_text, analysis, cache_version)
+            
+            yield analysis
+            
+        except Exception as e:
+            logger.error(f"LLM analysis failed: {e}")
+            yield self._fallback_analysis(contract)
+    
+    async def analyze_events_batch(self, contracts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze many event contracts concurrently
+        
+        Args:
+            contracts: List of contract information dictionaries
+            
+        Returns:
+            List of analysis results dictionaries, in input order
+        """
+        return await asyncio.gather(*(self.analyze_event(contract) for contract in contracts))
+    
     async def generate_research_plan(self, contract: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate a research plan for an event contract
@@ -139,17 +455,129 @@ class LLMReasoningEngine:
             contract_info = self._extract_contract_info(contract)
             prompt = self._create_research_prompt(contract_info)
             
-            response = await self._get_llm_response(
+            plan = await self._get_parsed_response(
+                "research_planning",
                 prompt,
-                system_prompt=self.system_prompts["research_planning"]
+                lambda response: self._parse_research_plan(response, contract)
             )
-            
-            return self._parse_research_plan(response, contract)
+            return {**plan, "contract_id": contract.get("id")}
             
         except Exception as e:
             logger.error(f"Research plan generation failed: {e}")
             return self._fallback_research_plan(contract)
     
+    async def generate_research_plans_batch(self, contracts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate research plans for many event contracts concurrently
+        
+        Args:
+            contracts: List of contract information dictionaries
+            
+        Returns:
+            List of research plan dictionaries, in input order
+        """
+        if getattr(self.config, "batch_research", False):
+            return await self.generate_research_plans_batched(contracts)
+        return await asyncio.gather(*(self.generate_research_plan(contract) for contract in contracts))
+    
+    async def generate_research_plans_batched(self, contracts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate research plans through the OpenAI Batch API
+        
+        Research plans are not latency critical, so uncached requests are
+        submitted as one batch job, which costs half as much but may take up
+        to the completion window. The job is polled until it finishes.
+        
+        Args:
+            contracts: List of contract information dictionaries
+            
+        Returns:
+            List of research plan dictionaries, in input order; contracts
+            whose request failed get the fallback plan
+        """
+        if self.client is None:
+            return [self._fallback_research_plan(contract) for contract in contracts]
+        
+        system_prompt = self.system_prompts["research_planning"]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(contracts)
+        pending = {}  # custom_id -> (index, cache key)
+        lines = []
+        
+        for index, contract in enumerate(contracts):
+            prompt = self._create_research_prompt(self._extract_contract_info(contract))
+            key = self._response_cache_key(system_prompt, prompt)
+            cached = self._cached_response(key, "research_planning")
+            if cached is not None:
+                results[index] = {**cached, "contract_id": contract.get("id")}
+                continue
+            
+            custom_id = str(index)
+            pending[custom_id] = (index, key)
+            lines.append(dumps_json({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._completion_params(prompt, system_prompt, {"type": "json_object"})
+            }, indent=False))
+        
+        if pending:
+            try:
+                output = await self._run_batch(b"\n".join(lines))
+                for line in output.splitlines():
+                    if not line.strip():
+                        continue
+                    record = loads_json(line)
+                    index, key = pending[record["custom_id"]]
+                    response = record.get("response") or {}
+                    if record.get("error") or response.get("status_code") != 200:
+                        logger.warning(f"Batch research plan request failed: {record.get('error')}")
+                        continue
+                    
+                    content = response["body"]["choices"][0]["message"]["content"]
+                    plan = self._parse_research_plan(content, contracts[index])
+                    self._store_response(key, plan)
+                    results[index] = plan
+                    
+            except Exception as e:
+                logger.error(f"Batch research plan generation failed: {e}")
+        
+        return [
+            result if result is not None else self._fallback_research_plan(contract)
+            for result, contract in zip(results, contracts)
+        ]
+    
+    async def _run_batch(self, requests_jsonl: bytes) -> str:
+        """
+        Run a chat completions batch job to completion
+        
+        Args:
+            requests_jsonl: Batch input file contents, one request per line
+            
+        Returns:
+            Batch output file contents
+        """
+        input_file = await self.client.files.create(
+            file=("requests.jsonl", requests_jsonl),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        logger.info(f"Submitted LLM batch {batch.id}")
+        
+        while batch.status not in BATCH_TERMINAL_STATUSES:
+            await asyncio.sleep(BATCH_POLL_INTERVAL)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"LLM batch {batch.id} ended with status {batch.status}")
+        
+        logger.info(f"LLM batch {batch.id} completed")
+        output = await self.client.files.content(batch.output_file_id)
+        return output.text
+    
     async def fact_check_information(self, information: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Fact-check information related to an event
@@ -165,32 +593,63 @@ class LLMReasoningEngine:
             return self._fallback_fact_check(information, context)
         
         try:
-            prompt = f"""
-            Information to fact-check: {information}
-            
-            Event context: {json.dumps(context, indent=2)}
-            
-            Please fact-check this information and provide:
-            1. Credibility assessment
-            2. Confidence score (0-1)
-            3. Reasoning
-            4. Potential biases or issues
-            5. Recommendations
-            """
+            prompt = FACT_CHECK_PROMPT_TEMPLATE.format(
+                information=information,
+                context=dumps_json(context).decode("utf-8")
+            )
             
-            response = await self._get_llm_response(
+            return await self._get_parsed_response(
+                "fact_checking",
                 prompt,
-                system_prompt=self.system_prompts["fact_checking"]
+                self._parse_fact_check_response
             )
             
-            return self._parse_fact_check_response(response)
-            
         except Exception as e:
             logger.error(f"Fact-checking failed: {e}")
             return self._fallback_fact_check(information, context)
     
+    async def fact_check_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Fact-check many pieces of information concurrently
+        
+        Args:
+            items: List of (information, context) pairs
+            
+        Returns:
+            List of fact-checking results, in input order
+        """
+        return await asyncio.gather(
+            *(self.fact_check_information(information, context) for information, context in items)
+        )
+    
     def _extract_contract_info(self, contract: Dict[str, Any]) -> str:
-        """Extract relevant information from contract for analysis"""
+        """
+        Extract relevant information from contract for analysis
+        
+        The result is memoized per contract version, so analysis, research
+        planning and streaming of the same contract serialize it only once.
+        Contracts without an id or updated_at stamp are not memoized.
+        """
+        contract_id = contract.get("id")
+        updated_at = contract.get("updated_at")
+        if contract_id is None or updated_at is None:
+            return self._build_contract_info(contract)
+        
+        version = (updated_at, contract.get("current_price"))
+        cached = self._info_cache.get(contract_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        info = self._build_contract_info(contract)
+        self._info_cache.pop(contract_id, None)
+        if len(self._info_cache) >= CONTRACT_INFO_CACHE_SIZE:
+            self._info_cache.pop(next(iter(self._info_cache)))
+        self._info_cache[contract_id] = (version, info)
+        return info
+    
+    @staticmethod
+    def _build_contract_info(contract: Dict[str, Any]) -> str:
+        """Format the contract fields used in prompts"""
         info_parts = []
         
         if "title" in contract:
@@ -200,7 +659,7 @@ class LLMReasoningEngine:
             info_parts.append(f"Description: {contract['description']}")
         
         if "outcomes" in contract:
-            info_parts.append(f"Outcomes: {json.dumps(contract['outcomes'], indent=2)}")
+            info_parts.append(f"Outcomes: {dumps_json(contract['outcomes']).decode('utf-8')}")
         
         if "expiration_date" in contract:
             info_parts.append(f"Expiration: {contract['expiration_date']}")
@@ -211,118 +670,259 @@ class LLMReasoningEngine:
         return "\n".join(info_parts)
     
     def _create_analysis_prompt(self, contract_info: str) -> str:
-        """Create prompt for event analysis"""
-        return f"""
-        Please analyze the following Kalshi event contract:
-        
-        {contract_info}
-        
-        Provide a comprehensive analysis including:
-        1. Probability assessment for each outcome
-        2. Key factors that could influence the result
-        3. Market sentiment analysis
-        4. Risk factors and uncertainties
-        5. Trading recommendations with confidence levels
-        6. Timeline considerations
-        7. Related events or correlations to monitor
-        
-        Format your response as JSON with the following structure:
-        {{
-            "probability_assessment": {{
-                "outcome_1": {{"probability": 0.0, "confidence": 0.0, "reasoning": ""}},
-                "outcome_2": {{"probability": 0.0, "confidence": 0.0, "reasoning": ""}}
-            }},
-            "key_factors": ["factor1", "factor2"],
-            "market_sentiment": "bullish/bearish/neutral",
-            "risk_factors": ["risk1", "risk2"],
-            "trading_recommendations": [
-                {{
-                    "action": "BUY/SELL/HOLD",
-                    "outcome": "outcome_name",
-                    "confidence": 0.0,
-                    "reasoning": ""
-                }}
-            ],
-            "timeline_considerations": "text",
-            "related_events": ["event1", "event2"]
-        }}
         """
+        Create prompt for event analysis
+        
+        The fixed instructions come before the contract details so that
+        requests share the longest possible prompt prefix, which the provider
+        caches across calls.
+        """
+        return ANALYSIS_PROMPT_TEMPLATE.format(contract_info=contract_info)
     
     def _create_research_prompt(self, contract_info: str) -> str:
-        """Create prompt for research planning"""
-        return f"""
-        Create a research plan for the following event contract:
+        """Create prompt for research planning, with the contract details last"""
+        return RESEARCH_PROMPT_TEMPLATE.format(contract_info=contract_info)
+    
+    async def _get_parsed_response(self, kind: str, prompt: str,
+                                   parse: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get and parse the LLM response to a prompt, reusing a cached result
+        
+        Args:
+            kind: Analysis type, selecting the system prompt and cache TTL
+            prompt: User prompt
+            parse: Parser turning the raw response into a result dictionary
+            
+        Returns:
+            Parsed result dictionary (shared with the cache; do not mutate)
+        """
+        system_prompt = self.system_prompts[kind]
+        key = self._response_cache_key(system_prompt, prompt)
         
-        {contract_info}
+        cached = self._cached_response(key, kind)
+        if cached is not None:
+            return cached
         
-        Provide a structured research plan including:
-        1. Key information needs
-        2. Data sources to investigate
-        3. Timeline for research
-        4. Priority research tasks
-        5. Success metrics
+        lock = self._response_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # Another caller may have fetched it while we waited
+                cached = self._cached_response(key, kind)
+                if cached is not None:
+                    return cached
+                
+                response = await self._get_llm_response(
+                    prompt,
+                    system_prompt=system_prompt,
+                    response_format={"type": "json_object"} if kind in JSON_RESPONSE_KINDS else None
+                )
+                result = parse(response)
+                self._store_response(key, result)
+                return result
+        finally:
+            if not lock.locked():
+                self._response_locks.pop(key, None)
+    
+    def _response_cache_key(self, system_prompt: str, prompt: str) -> str:
+        """Response cache key for a model and prompt pair"""
+        return hashlib.sha256(f"{self.model}|{system_prompt}|{prompt}".encode("utf-8")).hexdigest()
+    
+    def _cached_response(self, key: str, kind: str) -> Optional[Dict[str, Any]]:
+        """Cached parsed response, or None if missing or older than the kind's TTL"""
+        cached = self._response_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < RESPONSE_CACHE_TTLS[kind]:
+            return cached[1]
+        return None
+    
+    def _store_response(self, key: str, result: Dict[str, Any]):
+        """Cache a parsed response, evicting the oldest entry when full"""
+        self._response_cache.pop(key, None)
+        if len(self._response_cache) >= RESPONSE_CACHE_SIZE:
+            self._response_cache.pop(next(iter(self._response_cache)))
+        self._response_cache[key] = (time.monotonic(), result)
+    
+    async def _get_llm_response(self, prompt: str, system_prompt: str,
+                                response_format: Optional[Dict[str, Any]] = None) -> str:
+        """Get response from LLM, optionally constrained to a response format"""
+        if self.client is None:
+            raise RuntimeError("OpenAI client not available")
         
-        Format your response as JSON with the following structure:
-        {{
-            "information_needs": ["need1", "need2"],
-            "data_sources": ["source1", "source2"],
-            "timeline": {{
-                "immediate": ["task1", "task2"],
-                "short_term": ["task1", "task2"],
-                "ongoing": ["task1", "task2"]
-            }},
-            "priority_tasks": ["task1", "task2"],
-            "success_metrics": ["metric1", "metric2"]
-        }}
-        """
+        estimated_tokens = self._estimate_tokens(prompt, system_prompt)
+        deadline = time.monotonic() + self.request_deadline
+        
+        attempt = 0
+        while True:
+            try:
+                async with self._llm_semaphore:
+                    await self.rate_limiter.acquire(estimated_tokens)
+                    response = await self.client.chat.completions.create(
+                        **self._completion_params(prompt, system_prompt, response_format)
+                    )
+                
+                self._log_prompt_cache_usage(response)
+                return response.choices[0].message.content
+                
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    logger.error(f"LLM API call failed: {e}")
+                    raise
+                
+                attempt += 1
+                logger.warning(
+                    f"LLM API call failed: {e}; retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
     
-    async def _get_llm_response(self, prompt: str, system_prompt: str) -> str:
-        """Get response from LLM"""
+    async def _stream_llm_response(self, prompt: str, system_prompt: str,
+                                   response_format: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        Stream response text from LLM as it is generated
+        
+        Failures before any text arrives are retried like _get_llm_response;
+        once text has been yielded, errors propagate.
+        """
         if self.client is None:
             raise RuntimeError("OpenAI client not available")
         
+        estimated_tokens = self._estimate_tokens(prompt, system_prompt)
+        deadline = time.monotonic() + self.request_deadline
+        
+        attempt = 0
+        started = False
+        while True:
+            try:
+                async with self._llm_semaphore:
+                    await self.rate_limiter.acquire(estimated_tokens)
+                    stream = await self.client.chat.completions.create(
+                        **self._completion_params(prompt, system_prompt, response_format),
+                        stream=True
+                    )
+                    try:
+                        async for chunk in stream:
+                            text = chunk.choices[0].delta.content if chunk.choices else None
+                            if text:
+                                started = True
+                                yield text
+                    finally:
+                        await stream.response.aclose()
+                return
+                
+            except Exception as e:
+                delay = None if started else self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    logger.error(f"LLM API call failed: {e}")
+                    raise
+                
+                attempt += 1
+                logger.warning(
+                    f"LLM API call failed: {e}; retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+    
+    def _completion_params(self, prompt: str, system_prompt: str,
+                           response_format: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Chat completion request parameters"""
+        params = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": LLM_MAX_TOKENS
+        }
+        if response_format and self.json_mode:
+            params["response_format"] = response_format
+        return params
+    
+    def _estimate_tokens(self, prompt: str, system_prompt: str) -> int:
+        """Upper bound on the tokens a request consumes, for rate limiting"""
+        system_tokens = self._system_token_counts.get(system_prompt)
+        if system_tokens is None:
+            system_tokens = self._count_tokens(system_prompt)
+        return system_tokens + self._count_tokens(prompt) + LLM_MAX_TOKENS
+    
+    @staticmethod
+    def _log_prompt_cache_usage(response):
+        """Log how many prompt tokens the provider served from its prefix cache"""
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        if cached_tokens is not None:
+            logger.debug(f"LLM prompt cache: {cached_tokens}/{usage.prompt_tokens} prompt tokens cached")
+    
+    def _load_encoding(self):
+        """Load the tokenizer for the configured model, if tiktoken is available"""
+        if tiktoken is None:
+            return None
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            return response.choices[0].message.content
-            
+            return tiktoken.encoding_for_model(self.model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
         except Exception as e:
-            logger.error(f"LLM API call failed: {e}")
-            raise
+            logger.warning(f"Failed to load tokenizer, estimating token counts: {e}")
+            return None
+    
+    def _count_tokens(self, text: str) -> int:
+        """Number of tokens in text, estimated at 4 characters per token without tiktoken"""
+        if self._encoding is None:
+            return len(text) // 4 + 1
+        return len(self._encoding.encode(text))
+    
+    def _retry_delay(self, error: Exception, attempt: int, deadline: float) -> Optional[float]:
+        """
+        Seconds to wait before retrying a failed LLM request
+        
+        Args:
+            error: Error raised by the request
+            attempt: Number of retries already made
+            deadline: time.monotonic() value by which the request must finish
+            
+        Returns:
+            Delay in seconds, or None if the request should not be retried
+        """
+        if attempt >= self.max_retries:
+            return None
+        
+        delay = self._backoff_delay(error, attempt)
+        if delay is None or time.monotonic() + delay >= deadline:
+            return None
+        return delay
+    
+    def _backoff_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Backoff before the next retry, or None if the error is not retryable"""
+        if isinstance(error, openai.RateLimitError):
+            # Honor the server's requested wait when given
+            headers = error.response.headers
+            delay = _parse_retry_after(headers.get("retry-after-ms"), headers.get("retry-after"))
+            if delay is None:
+                delay = _parse_duration(headers.get("x-ratelimit-reset-requests"))
+            if delay is not None:
+                return delay
+        elif not isinstance(error, (openai.APIConnectionError, openai.APITimeoutError,
+                                    openai.InternalServerError)):
+            return None
+        
+        backoff = min(self.retry_backoff_cap, self.retry_backoff_base * 2 ** attempt)
+        return backoff * random.uniform(0.5, 1.5)
     
     def _parse_analysis_response(self, response: str, contract: Dict[str, Any]) -> Dict[str, Any]:
         """Parse LLM analysis response"""
         try:
-            # Try to parse as JSON
-            if response.strip().startswith("{"):
-                parsed = json.loads(response)
-            else:
-                # Fallback parsing for non-JSON responses
-                parsed = self._parse_text_response(response)
-            
-            return {
-                "contract_id": contract.get("id"),
-                "analysis": parsed,
-                "timestamp": asyncio.get_event_loop().time(),
-                "model": self.model
-            }
-            
+            # With JSON mode this only fails on truncated output; models
+            # without JSON mode may also answer in prose
+            parsed = loads_json(response)
         except json.JSONDecodeError:
             logger.warning("Failed to parse LLM response as JSON, using text parsing")
-            return {
-                "contract_id": contract.get("id"),
-                "analysis": self._parse_text_response(response),
-                "timestamp": asyncio.get_event_loop().time(),
-                "model": self.model
-            }
+            parsed = self._parse_text_response(response)
+        
+        return {
+            "contract_id": contract.get("id"),
+            "analysis": parsed,
+            "timestamp": time.monotonic(),
+            "model": self.model
+        }
     
     def _parse_text_response(self, response: str) -> Dict[str, Any]:
         """Parse text response when JSON parsing fails"""
@@ -340,23 +940,15 @@ class LLMReasoningEngine:
     def _parse_research_plan(self, response: str, contract: Dict[str, Any]) -> Dict[str, Any]:
         """Parse research plan response"""
         try:
-            if response.strip().startswith("{"):
-                parsed = json.loads(response)
-            else:
-                parsed = {"raw_response": response}
-            
-            return {
-                "contract_id": contract.get("id"),
-                "research_plan": parsed,
-                "timestamp": asyncio.get_event_loop().time()
-            }
-            
+            parsed = loads_json(response)
         except json.JSONDecodeError:
-            return {
-                "contract_id": contract.get("id"),
-                "research_plan": {"raw_response": response},
-                "timestamp": asyncio.get_event_loop().time()
-            }
+            parsed = {"raw_response": response}
+        
+        return {
+            "contract_id": contract.get("id"),
+            "research_plan": parsed,
+            "timestamp": time.monotonic()
+        }
     
     def _parse_fact_check_response(self, response: str) -> Dict[str, Any]:
         """Parse fact-checking response"""
@@ -382,7 +974,7 @@ class LLMReasoningEngine:
                 "timeline_considerations": "Manual analysis required",
                 "related_events": []
             },
-            "timestamp": asyncio.get_event_loop().time(),
+            "timestamp": time.monotonic(),
             "model": "fallback"
         }
     
@@ -397,7 +989,7 @@ class LLMReasoningEngine:
                 "priority_tasks": ["Manual analysis"],
                 "success_metrics": ["Manual assessment"]
             },
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": time.monotonic()
         }
     
     def _fallback_fact_check(self, information: str, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -409,4 +1001,85 @@ class LLMReasoningEngine:
             "reasoning": "LLM fact-checking not available",
             "biases": [],
             "recommendations": ["Manual verification required"]
-        }
\ No newline at end of file
+        }
+
+
+def _parse_retry_after(retry_after_ms: Optional[str], retry_after: Optional[str]) -> Optional[float]:
+    """Seconds requested by retry-after-ms / retry-after headers, if numeric"""
+    try:
+        if retry_after_ms is not None:
+            return float(retry_after_ms) / 1000.0
+        if retry_after is not None:
+            return float(retry_after)
+    except ValueError:
+        pass
+    return None
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds in an OpenAI rate limit reset duration such as 6m0s or 20ms"""
+    if not value:
+        return None
+    parts = _DURATION_PART_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class _StreamingObjectParser:
+    """
+    Incremental scanner for a JSON object arriving in chunks
+    
+    Tracks nesting outside of strings to find where each top-level member
+    ends, so the members completed so far can be parsed before the object
+    is closed.
+    """
+    
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._boundary = 0  # index just past the last complete top-level member
+    
+    def feed(self, text: str) -> bool:
+        """Append streamed text; returns True if another top-level member completed"""
+        self.buffer += text
+        advanced = False
+        
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._boundary = i
+                    advanced = True
+            elif char == "," and self._depth == 1:
+                self._boundary = i
+                advanced = True
+        self._pos = len(buffer)
+        
+        return advanced
+    
+    def members(self) -> Optional[Dict[str, Any]]:
+        """Top-level members completed so far, or None if none can be parsed"""
+        start = self.buffer.find("{")
+        if start < 0 or self._boundary <= start:
+            return None
+        try:
+            return loads_json(self.buffer[start:self._boundary] + "}")
+        except json.JSONDecodeError:
+            return None
\ No newline at end of file
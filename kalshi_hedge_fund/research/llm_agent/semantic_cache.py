@@ -0,0 +1,207 @@
+"""
+Semantic Cache for LLM Analyses
+
+This module caches LLM analyses by the meaning of the contract text, so that
+contracts with near-identical titles and descriptions reuse a prior analysis
+instead of issuing another LLM call.
+"""
+
+import asyncio
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from fastembed import TextEmbedding
+except ImportError:
+    TextEmbedding = None
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Dimension of the hashed bag-of-words fallback embedding
+HASHED_EMBEDDING_DIM = 1024
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+class SemanticCache:
+    """
+    Cache of values keyed by text similarity
+    
+    Texts are embedded (with FastEmbed when installed, otherwise a hashed
+    bag-of-words vector) and a lookup returns the value of the most similar
+    cached text when its cosine similarity exceeds the threshold. Entries are
+    only compared within the same namespace and version (e.g. the contract's
+    price) and when the texts mention exactly the same numbers, since
+    contracts such as "above 50k" and "above 60k" read alike but must not
+    share an analysis. Entries expire after ttl seconds.
+    
+    The embedding model is loaded on first use and embeddings are computed in
+    a worker thread, so neither blocks the event loop.
+    """
+    
+    def __init__(self, threshold: float = 0.85, max_entries: int = 1000, ttl: float = 3600.0):
+        """
+        Initialize the semantic cache
+        
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached entries (oldest evicted first)
+            ttl: Seconds an entry stays valid
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        
+        # Loaded lazily by _get_embedder
+        self._embedder = None
+        self._embedder_loaded = TextEmbedding is None
+        self._embedder_lock = asyncio.Lock()
+        
+        # (namespace, version, numbers) -> [embedding matrix or None, vectors, values]
+        self._buckets: Dict[Tuple[Any, ...], List[Any]] = {}
+        # entry id -> (bucket key, time cached), oldest first
+        self._order: "OrderedDict[int, Tuple[Tuple[Any, ...], float]]" = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+    
+    async def get(self, namespace: str, text: str, version: Any = None) -> Optional[Any]:
+        """
+        Look up the value cached for the most similar text
+        
+        Args:
+            namespace: Cache partition (e.g. the LLM model name)
+            text: Text to match
+            version: Hashable value that must match exactly (e.g. the price)
+        
+        Returns:
+            Cached value, or None on a miss
+        """
+        self._expire()
+        
+        bucket = self._buckets.get(self._bucket_key(namespace, version, text))
+        if bucket is None:
+            self.misses += 1
+            return None
+        
+        vector = await self._embed(text)
+        
+        # The bucket may have changed while embedding
+        if not bucket[1]:
+            self.misses += 1
+            return None
+        if bucket[0] is None:
+            bucket[0] = np.vstack([vector for _, vector in bucket[1]])
+        
+        similarities = bucket[0] @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return bucket[2][best]
+    
+    async def put(self, namespace: str, text: str, value: Any, version: Any = None):
+        """
+        Cache a value for a text
+        
+        Args:
+            namespace: Cache partition (e.g. the LLM model name)
+            text: Text the value was computed from
+            value: Value to cache
+            version: Hashable value a lookup must match exactly (e.g. the price)
+        """
+        vector = await self._embed(text)
+        
+        key = self._bucket_key(namespace, version, text)
+        bucket = self._buckets.setdefault(key, [None, [], []])
+        
+        entry_id = self._next_id
+        self._next_id += 1
+        bucket[0] = None
+        bucket[1].append((entry_id, vector))
+        bucket[2].append(value)
+        self._order[entry_id] = (key, time.monotonic())
+        
+        while len(self._order) > self.max_entries:
+            self._evict_oldest()
+    
+    def clear(self):
+        """Remove all cached entries"""
+        self._buckets.clear()
+        self._order.clear()
+    
+    def _expire(self):
+        """Remove entries older than the TTL; they are always the oldest ones"""
+        cutoff = time.monotonic() - self.ttl
+        while self._order and next(iter(self._order.values()))[1] <= cutoff:
+            self._evict_oldest()
+    
+    def _evict_oldest(self):
+        """Remove the oldest cached entry"""
+        entry_id, (key, _) = self._order.popitem(last=False)
+        bucket = self._buckets[key]
+        index = next(i for i, (eid, _) in enumerate(bucket[1]) if eid == entry_id)
+        del bucket[1][index]
+        del bucket[2][index]
+        bucket[0] = None
+        if not bucket[1]:
+            del self._buckets[key]
+    
+    @staticmethod
+    def _bucket_key(namespace: str, version: Any, text: str) -> Tuple[Any, ...]:
+        """Partition key: namespace, version and the numbers mentioned in the text"""
+        return namespace, version, tuple(_NUMBER_RE.findall(text))
+    
+    async def _get_embedder(self):
+        """Load the embedding model in a worker thread on first use"""
+        if not self._embedder_loaded:
+            async with self._embedder_lock:
+                if not self._embedder_loaded:
+                    try:
+                        self._embedder = await asyncio.to_thread(TextEmbedding, EMBEDDING_MODEL)
+                    except Exception as e:
+                        logger.warning(f"Failed to load embedding model, using hashed embeddings: {e}")
+                    self._embedder_loaded = True
+        return self._embedder
+    
+    async def _embed(self, text: str) -> np.ndarray:
+        """Embed text as a unit-length vector, off the event loop"""
+        embedder = await self._get_embedder()
+        if embedder is not None:
+            return await asyncio.to_thread(_model_embedding, embedder, text)
+        return _unit(_hashed_embedding(text))
+
+
+def _model_embedding(embedder, text: str) -> np.ndarray:
+    """Embed text with a FastEmbed model as a unit-length vector"""
+    return _unit(np.asarray(next(iter(embedder.embed([text]))), dtype=np.float32))
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    """Scale a vector to unit length"""
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def _hashed_embedding(text: str) -> np.ndarray:
+    """Bag of words and word bigrams, hashed into a fixed-size count vector"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    vector = np.zeros(HASHED_EMBEDDING_DIM, dtype=np.float32)
+    for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        vector[zlib.crc32(feature.encode("utf-8")) % HASHED_EMBEDDING_DIM] += 1.0
+    return vector
\ No newline at end of file
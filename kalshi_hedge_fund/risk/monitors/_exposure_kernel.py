@@ -0,0 +1,46 @@
+"""
+Numeric kernel for portfolio exposure aggregation
+
+Computes the total absolute exposure and the largest position from an array
+of position sizes. When numba is installed the kernel is compiled to native
+code as a single fused pass; otherwise the equivalent NumPy implementation
+is used.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _exposure_kernel_numpy(sizes):
+    """NumPy implementation of the exposure kernel"""
+    abs_sizes = np.abs(sizes)
+    total_exposure = float(abs_sizes.sum())
+    largest_index = int(abs_sizes.argmax()) if abs_sizes.size else -1
+    return total_exposure, largest_index
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _exposure_kernel_numba(sizes):
+        """Fused single-pass implementation of the exposure kernel"""
+        total_exposure = 0.0
+        largest_index = -1
+        largest_size = -1.0
+        
+        for i in range(sizes.shape[0]):
+            size = abs(sizes[i])
+            total_exposure += size
+            if size > largest_size:
+                largest_size = size
+                largest_index = i
+        
+        return total_exposure, largest_index
+    
+    exposure_kernel = _exposure_kernel_numba
+else:
+    exposure_kernel = _exposure_kernel_numpy
\ No newline at end of file
@@ -5,16 +5,25 @@ This module monitors portfolio exposure, position limits, and risk metrics
 to ensure the trading strategy stays within acceptable risk parameters.
 """
 
-import asyncio
+import time
+from collections import deque
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
 import numpy as np
 
 try:
     from loguru import logger
 except ImportError:
     import logging
-    logger = logging.getLogger(__name__)
+    from ...utils.logger import BraceStyleAdapter
+    logger = BraceStyleAdapter(logging.getLogger(__name__), {})
+
+from ...utils.timestamps import iso_timestamp
+from ._exposure_kernel import exposure_kernel
+
+
+# Number of risk metric snapshots and alerts kept
+RISK_HISTORY_SIZE = 100
+ALERTS_SIZE = 50
 
 
 class ExposureMonitor:
@@ -35,8 +44,11 @@ class ExposureMonitor:
         self.config = config
         self.positions = {}
         self.risk_limits = config.get_risk_limits()
-        self.risk_history = []
-        self.alerts = []
+        self.risk_history = deque(maxlen=RISK_HISTORY_SIZE)
+        self.alerts = deque(maxlen=ALERTS_SIZE)
+        
+        # Highest total_value recorded in risk_history, for drawdowns
+        self._peak_value: Optional[float] = None
         
         logger.info("Exposure Monitor initialized")
     
@@ -53,38 +65,36 @@ class ExposureMonitor:
         try:
             logger.info("Checking signal against risk limits")
             
-            # Get current portfolio state
+            # Get current portfolio state (the only await; all checks are synchronous)
             portfolio = await self._get_current_portfolio()
             
-            # Check various risk metrics
-            checks = {}
-            
-            # Position size check
-            checks["position_size"] = self._check_position_size(signal, portfolio)
-            
-            # Portfolio concentration check
-            checks["concentration"] = self._check_concentration(signal, portfolio)
-            
-            # Correlation check
-            checks["correlation"] = await self._check_correlation(signal, portfolio)
+            # Run the checks cheapest first and stop at the first failure;
+            # concentration is last since it may have to index every position
+            if not self._check_position_size(signal, portfolio):
+                return self._reject_signal("position_size")
             
-            # Drawdown check
-            checks["drawdown"] = self._check_drawdown(portfolio)
+            if not self._check_drawdown(portfolio):
+                return self._reject_signal("drawdown")
             
-            # Overall risk assessment
-            all_passed = all(checks.values())
+            if not self._check_correlation(signal, portfolio):
+                return self._reject_signal("correlation")
             
-            if not all_passed:
-                failed_checks = [k for k, v in checks.items() if not v]
-                logger.warning(f"Signal failed risk checks: {failed_checks}")
-                self._add_alert("RISK_LIMIT_EXCEEDED", f"Failed checks: {failed_checks}")
+            if not self._check_concentration(signal, portfolio):
+                return self._reject_signal("concentration")
             
-            return all_passed
+            return True
             
         except Exception as e:
             logger.error(f"Risk check failed: {e}")
             return False
     
+    def _reject_signal(self, failed_check: str) -> bool:
+        """Record a failed risk check; returns False for check_signal to return"""
+        failed_checks = [failed_check]
+        logger.warning("Signal failed risk checks: {}", failed_checks)
+        self._add_alert("RISK_LIMIT_EXCEEDED", f"Failed checks: {failed_checks}")
+        return False
+    
     def _check_position_size(self, signal: Dict[str, Any], portfolio: Dict[str, Any]) -> bool:
         """Check if position size is within limits"""
         try:
@@ -106,7 +116,7 @@ class ExposureMonitor:
             is_within_limit = adjusted_size <= max_allowed
             
             if not is_within_limit:
-                logger.warning(f"Position size {adjusted_size:.2f} exceeds limit {max_allowed:.2f}")
+                logger.warning("Position size {:.2f} exceeds limit {:.2f}", adjusted_size, max_allowed)
             
             return is_within_limit
             
@@ -121,13 +131,14 @@ class ExposureMonitor:
             if not contract_id:
                 return True
             
-            positions = portfolio.get("positions", [])
+            # Index the snapshot's positions on first use; only this check needs it
+            exposure_by_id = portfolio.get("exposure_by_id")
+            if exposure_by_id is None:
+                exposure_by_id = self._index_positions(portfolio.get("positions", []))
+                portfolio["exposure_by_id"] = exposure_by_id
             
             # Calculate current exposure to this contract
-            current_exposure = 0.0
-            for position in positions:
-                if position.get("contract_id") == contract_id:
-                    current_exposure += abs(float(position.get("size", 0.0)))
+            current_exposure = exposure_by_id.get(contract_id, 0.0)
             
             # Check if adding this position would exceed concentration limit
             portfolio_value = portfolio.get("total_value", 0.0)
@@ -143,7 +154,7 @@ class ExposureMonitor:
             logger.error(f"Concentration check failed: {e}")
             return False
     
-    async def _check_correlation(self, signal: Dict[str, Any], portfolio: Dict[str, Any]) -> bool:
+    def _check_correlation(self, signal: Dict[str, Any], portfolio: Dict[str, Any]) -> bool:
         """Check correlation with existing positions"""
         try:
             # This is a simplified correlation check
@@ -160,7 +171,7 @@ class ExposureMonitor:
             max_positions = 20  # Arbitrary limit
             
             if num_positions >= max_positions:
-                logger.warning(f"High number of positions: {num_positions}")
+                logger.warning("High number of positions: {}", num_positions)
                 return False
             
             return True
@@ -176,15 +187,15 @@ class ExposureMonitor:
             current_value = portfolio.get("total_value", 0.0)
             
             # Get peak value from history
-            if self.risk_history:
-                peak_value = max([entry.get("total_value", 0.0) for entry in self.risk_history])
+            peak_value = self._peak_value
+            if peak_value is not None:
                 if peak_value > 0:
                     drawdown = (peak_value - current_value) / peak_value
                     
                     max_drawdown = self.risk_limits["max_drawdown"]
                     
                     if drawdown > max_drawdown:
-                        logger.warning(f"Drawdown {drawdown:.2%} exceeds limit {max_drawdown:.2%}")
+                        logger.warning("Drawdown {:.2%} exceeds limit {:.2%}", drawdown, max_drawdown)
                         return False
             
             return True
@@ -210,7 +221,7 @@ class ExposureMonitor:
                 else:  # SELL
                     self.positions[contract_id] -= size
                 
-                logger.info(f"Updated position tracking for {contract_id}: {self.positions[contract_id]}")
+                logger.info("Updated position tracking for {}: {}", contract_id, self.positions[contract_id])
                 
         except Exception as e:
             logger.error(f"Position update failed: {e}")
@@ -220,7 +231,7 @@ class ExposureMonitor:
         Get current risk metrics
         
         Returns:
-            Risk metrics dictionary
+            Risk metrics dictionary, with an ISO format "timestamp"
         """
         try:
             portfolio = await self._get_current_portfolio()
@@ -235,9 +246,11 @@ class ExposureMonitor:
             positions = portfolio.get("positions", [])
             metrics["num_positions"] = len(positions)
             
+            total_exposure, largest_index = exposure_kernel(self._position_sizes(positions))
+            
             # Largest position
             if positions:
-                largest_position = max(positions, key=lambda x: abs(float(x.get("size", 0.0))))
+                largest_position = positions[largest_index]
                 metrics["largest_position"] = {
                     "contract_id": largest_position.get("contract_id"),
                     "size": float(largest_position.get("size", 0.0))
@@ -245,14 +258,13 @@ class ExposureMonitor:
             
             # Portfolio concentration
             if metrics["total_value"] > 0:
-                total_exposure = sum(abs(float(p.get("size", 0.0))) for p in positions)
-                metrics["concentration"] = total_exposure / metrics["total_value"]
+                metrics["concentration"] = float(total_exposure) / metrics["total_value"]
             else:
                 metrics["concentration"] = 0.0
             
             # Drawdown calculation
-            if self.risk_history:
-                peak_value = max([entry.get("total_value", 0.0) for entry in self.risk_history])
+            peak_value = self._peak_value
+            if peak_value is not None:
                 if peak_value > 0:
                     metrics["drawdown"] = (peak_value - metrics["total_value"]) / peak_value
                 else:
@@ -267,25 +279,59 @@ class ExposureMonitor:
                 "var_limit": self.risk_limits["var_limit"]
             }
             
-            # Add timestamp
-            metrics["timestamp"] = datetime.now().isoformat()
+            # Add timestamp (epoch nanoseconds)
+            metrics["timestamp_ns"] = time.time_ns()
             
-            # Store in history
+            # Store in history (oldest entries drop off automatically)
             self.risk_history.append(metrics)
+            if self._peak_value is None or metrics["total_value"] > self._peak_value:
+                self._peak_value = metrics["total_value"]
             
-            # Keep only recent history (last 100 entries)
-            if len(self.risk_history) > 100:
-                self.risk_history = self.risk_history[-100:]
-            
-            return metrics
+            return {**metrics, "timestamp": iso_timestamp(metrics["timestamp_ns"])}
             
         except Exception as e:
             logger.error(f"Risk metrics calculation failed: {e}")
+            timestamp_ns = time.time_ns()
             return {
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": timestamp_ns,
+                "timestamp": iso_timestamp(timestamp_ns)
             }
     
+    @staticmethod
+    def _index_positions(positions: List[Dict[str, Any]]) -> Dict[Any, float]:
+        """
+        Index positions by contract
+        
+        Args:
+            positions: List of position dictionaries
+            
+        Returns:
+            Dictionary mapping contract ID to total absolute position size
+        """
+        exposure_by_id: Dict[Any, float] = {}
+        for position in positions:
+            contract_id = position.get("contract_id")
+            exposure_by_id[contract_id] = exposure_by_id.get(contract_id, 0.0) + abs(float(position.get("size", 0.0)))
+        return exposure_by_id
+    
+    @staticmethod
+    def _position_sizes(positions: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Convert positions to an array of sizes
+        
+        Args:
+            positions: List of position dictionaries
+            
+        Returns:
+            Array of signed position sizes
+        """
+        return np.fromiter(
+            (float(position.get("size", 0.0)) for position in positions),
+            dtype=np.float64,
+            count=len(positions)
+        )
+    
     async def _get_current_portfolio(self) -> Dict[str, Any]:
         """Get current portfolio state"""
         # This would typically get data from the trader
@@ -293,7 +339,7 @@ class ExposureMonitor:
         return {
             "total_value": 10000.0,
             "positions": [],
-            "timestamp": datetime.now().isoformat()
+            "timestamp_ns": time.time_ns()
         }
     
     def _add_alert(self, alert_type: str, message: str):
@@ -301,15 +347,11 @@ class ExposureMonitor:
         alert = {
             "type": alert_type,
             "message": message,
-            "timestamp": datetime.now().isoformat()
+            "timestamp_ns": time.time_ns()
         }
         self.alerts.append(alert)
         
-        # Keep only recent alerts (last 50)
-        if len(self.alerts) > 50:
-            self.alerts = self.alerts[-50:]
-        
-        logger.warning(f"Risk alert: {alert_type} - {message}")
+        logger.warning("Risk alert: {} - {}", alert_type, message)
     
     def get_alerts(self, alert_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -319,12 +361,13 @@ class ExposureMonitor:
             alert_type: Optional filter for alert type
             
         Returns:
-            List of alert dictionaries
+            List of alert dictionaries, with an ISO format "timestamp"
         """
-        if alert_type:
-            return [alert for alert in self.alerts if alert["type"] == alert_type]
-        else:
-            return self.alerts.copy()
+        return [
+            {**alert, "timestamp": iso_timestamp(alert["timestamp_ns"])}
+            for alert in self.alerts
+            if not alert_type or alert["type"] == alert_type
+        ]
     
     def clear_alerts(self):
         """Clear all alerts"""
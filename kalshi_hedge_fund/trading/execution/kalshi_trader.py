@@ -6,14 +6,49 @@ including order placement, management, and portfolio tracking.
 """
 
 import asyncio
+import itertools
+import time
+from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+import numpy as np
 
 try:
     from loguru import logger
 except ImportError:
     import logging
-    logger = logging.getLogger(__name__)
+    from ...utils.logger import BraceStyleAdapter
+    logger = BraceStyleAdapter(logging.getLogger(__name__), {})
+
+
+# How long a fetched portfolio is reused before it is fetched again
+PORTFOLIO_CACHE_TTL = 1.0  # seconds
+
+# Position size limits
+MIN_POSITION_SIZE = 10.0  # Minimum $10 position
+MAX_POSITION_FRACTION = 0.1  # Maximum 10% of portfolio
+
+# Simulated order ids: process start time plus a per-process sequence number
+_BOOT_NS = time.time_ns()
+_ORDER_SEQ = itertools.count()
+
+
+@dataclass(slots=True)
+class OrderParams:
+    """Order to place, as computed from the signal and order book"""
+    
+    price: float
+    size: float
+    type: str = "market"
+
+
+@dataclass(slots=True)
+class OrderFill:
+    """Outcome of placing an order"""
+    
+    order_id: str
+    status: str
+    filled_price: float
+    filled_size: float
 
 
 class KalshiTrader:
@@ -24,6 +59,15 @@ class KalshiTrader:
     on the Kalshi prediction market platform.
     """
     
+    __slots__ = (
+        "config", "api_collector", "positions", "orders", "portfolio_value",
+        "_portfolio_cache", "_portfolio_ts", "_portfolio_ttl", "_max_position_size",
+        "_sim_delay"
+    )
+    
+    _REQUIRED_FIELDS = frozenset(("action", "confidence", "contract_id"))
+    _VALID_ACTIONS = frozenset(("BUY", "SELL", "HOLD"))
+    
     def __init__(self, config):
         """
         Initialize the Kalshi trader
@@ -37,6 +81,17 @@ class KalshiTrader:
         self.orders = {}
         self.portfolio_value = 0.0
         
+        # Read once; position sizing runs for every signal
+        self._max_position_size = float(config.max_position_size)
+        
+        # Simulated API latency for order placement and cancellation
+        self._sim_delay = getattr(config, "simulation_delay", 0.0)
+        
+        # Last get_portfolio() result and when it was fetched (monotonic)
+        self._portfolio_cache: Optional[Dict[str, Any]] = None
+        self._portfolio_ts = 0.0
+        self._portfolio_ttl = PORTFOLIO_CACHE_TTL
+        
         logger.info("Kalshi Trader initialized")
     
     def set_api_collector(self, api_collector):
@@ -55,68 +110,184 @@ class KalshiTrader:
             Execution results dictionary
         """
         try:
-            logger.info(f"Executing signal: {signal.get('action', 'UNKNOWN')}")
+            logger.info("Executing signal: {}", signal.get("action", "UNKNOWN"))
             
             if not self.api_collector:
                 raise RuntimeError("API collector not set")
             
-            # Validate signal
-            if not self._validate_signal(signal):
-                return {
-                    "status": "REJECTED",
-                    "reason": "Invalid signal",
-                    "signal": signal
-                }
+            skipped = self._screen_signal(signal)
+            if skipped is not None:
+                return skipped
             
-            # Get current portfolio
-            portfolio = await self.get_portfolio()
+            # Get current portfolio (reused across a burst of signals)
+            portfolio = await self._get_portfolio_cached()
             
             # Calculate position size
             position_size = self._calculate_position_size(signal, portfolio)
             
             if position_size <= 0:
-                return {
-                    "status": "SKIPPED",
-                    "reason": "Zero position size",
-                    "signal": signal
-                }
+                return self._skipped(signal, "Zero position size")
+            
+            return await self._execute_sized(signal, position_size)
             
+        except Exception as e:
+            return self._failed(signal, e)
+    
+    async def execute_signals(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute many trading signals
+        
+        The portfolio is fetched once and the signals are sized one after
+        another against it, so that together they stay within the cash
+        balance and per-contract position limit. Only order submission runs
+        concurrently.
+        
+        Args:
+            signals: List of trading signal dictionaries
+            
+        Returns:
+            List of execution results dictionaries, in input order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(signals)
+        orders = []
+        
+        try:
+            if not self.api_collector:
+                raise RuntimeError("API collector not set")
+            
+            screened = []
+            for index, signal in enumerate(signals):
+                results[index] = self._screen_signal(signal)
+                if results[index] is None:
+                    screened.append(index)
+            
+            if screened:
+                portfolio = await self._get_portfolio_cached()
+                max_size = portfolio.get("total_value", 0.0) * MAX_POSITION_FRACTION
+                cash = portfolio.get("cash_balance")
+                committed: Dict[Any, float] = {}
+                
+                for index in screened:
+                    signal = signals[index]
+                    contract_id = signal["contract_id"]
+                    
+                    position_size = self._calculate_position_size(signal, portfolio)
+                    
+                    # Earlier signals in the batch count against the contract's limit
+                    already_committed = committed.get(contract_id, 0.0)
+                    if already_committed:
+                        position_size = min(position_size, max_size - already_committed)
+                        if position_size < MIN_POSITION_SIZE:
+                            results[index] = self._skipped(signal, "Position limit reached")
+                            continue
+                    
+                    if position_size <= 0:
+                        results[index] = self._skipped(signal, "Zero position size")
+                        continue
+                    if cash is not None:
+                        if position_size > cash:
+                            results[index] = self._skipped(signal, "Insufficient cash balance")
+                            continue
+                        cash -= position_size
+                    
+                    committed[contract_id] = committed.get(contract_id, 0.0) + position_size
+                    orders.append((index, position_size))
+            
+        except Exception as e:
+            for index, signal in enumerate(signals):
+                if results[index] is None:
+                    results[index] = self._failed(signal, e)
+            return results
+        
+        executions = await asyncio.gather(
+            *(self._execute_sized(signals[index], position_size) for index, position_size in orders),
+            return_exceptions=True
+        )
+        for (index, _), execution in zip(orders, executions):
+            if isinstance(execution, Exception):
+                execution = self._failed(signals[index], execution)
+            results[index] = execution
+        
+        return results
+    
+    def _screen_signal(self, signal: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Check whether a signal should be traded at all
+        
+        Args:
+            signal: Trading signal dictionary
+            
+        Returns:
+            Rejection or skip result, or None if the signal should be sized and traded
+        """
+        # Validate signal
+        if not self._validate_signal(signal):
+            return {
+                "status": "REJECTED",
+                "reason": "Invalid signal",
+                "signal": signal
+            }
+        
+        # Nothing to trade, so skip the portfolio fetch and order book lookup
+        if signal["action"] == "HOLD":
+            return self._skipped(signal, "HOLD signal - no trade needed")
+        
+        if signal["confidence"] < self.config.min_confidence_threshold:
+            return self._skipped(signal, "Below confidence threshold")
+        
+        return None
+    
+    async def _execute_sized(self, signal: Dict[str, Any], position_size: float) -> Dict[str, Any]:
+        """Place the order for a sized signal and update portfolio tracking"""
+        try:
             # Execute the trade
             execution_result = await self._place_order(signal, position_size)
             
             # Update portfolio tracking
             await self._update_portfolio(execution_result)
             
-            logger.info(f"Trade executed: {execution_result.get('status', 'UNKNOWN')}")
+            logger.info("Trade executed: {}", execution_result.get("status", "UNKNOWN"))
             return execution_result
             
         except Exception as e:
-            logger.error(f"Trade execution failed: {e}")
-            return {
-                "status": "FAILED",
-                "reason": str(e),
-                "signal": signal
-            }
+            return self._failed(signal, e)
+    
+    @staticmethod
+    def _skipped(signal: Dict[str, Any], reason: str) -> Dict[str, Any]:
+        """Result for a signal that is not traded"""
+        return {
+            "status": "SKIPPED",
+            "reason": reason,
+            "signal": signal
+        }
+    
+    @staticmethod
+    def _failed(signal: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Log a failed execution and build its result"""
+        logger.error(f"Trade execution failed: {error}")
+        return {
+            "status": "FAILED",
+            "reason": str(error),
+            "signal": signal
+        }
     
     def _validate_signal(self, signal: Dict[str, Any]) -> bool:
         """Validate trading signal"""
-        required_fields = ["action", "confidence", "contract_id"]
-        
-        for field in required_fields:
-            if field not in signal:
-                logger.warning(f"Signal missing required field: {field}")
-                return False
+        missing_fields = self._REQUIRED_FIELDS - signal.keys()
+        if missing_fields:
+            logger.warning("Signal missing required fields: {}", sorted(missing_fields))
+            return False
         
         # Validate action
-        valid_actions = ["BUY", "SELL", "HOLD"]
-        if signal["action"] not in valid_actions:
-            logger.warning(f"Invalid action: {signal['action']}")
+        action = signal["action"]
+        if not isinstance(action, str) or action not in self._VALID_ACTIONS:
+            logger.warning("Invalid action: {}", action)
             return False
         
         # Validate confidence
         confidence = signal["confidence"]
         if not (0.0 <= confidence <= 1.0):
-            logger.warning(f"Invalid confidence: {confidence}")
+            logger.warning("Invalid confidence: {}", confidence)
             return False
         
         return True
@@ -130,20 +301,16 @@ class KalshiTrader:
             if portfolio_value <= 0:
                 return 0.0
             
-            # Base position size as percentage of portfolio
-            base_size = portfolio_value * self.config.max_position_size
-            
-            # Adjust based on confidence
-            confidence = signal.get("confidence", 0.0)
-            adjusted_size = base_size * confidence
-            
-            # Apply minimum and maximum limits
-            min_size = 10.0  # Minimum $10 position
-            max_size = portfolio_value * 0.1  # Maximum 10% of portfolio
+            # Base position size as percentage of portfolio, adjusted based on confidence
+            adjusted_size = portfolio_value * self._max_position_size * signal.get("confidence", 0.0)
             
-            position_size = max(min_size, min(adjusted_size, max_size))
+            # Apply maximum then minimum limits (the minimum wins if they cross)
+            max_size = portfolio_value * MAX_POSITION_FRACTION
+            position_size = adjusted_size if adjusted_size < max_size else max_size
+            if position_size < MIN_POSITION_SIZE:
+                position_size = MIN_POSITION_SIZE
             
-            logger.info(f"Calculated position size: ${position_size:.2f}")
+            logger.info("Calculated position size: ${:.2f}", position_size)
             return position_size
             
         except Exception as e:
@@ -178,12 +345,12 @@ class KalshiTrader:
             
             return {
                 "status": "EXECUTED",
-                "order_id": order_result.get("order_id"),
+                "order_id": order_result.order_id,
                 "contract_id": contract_id,
                 "action": action,
                 "size": position_size,
-                "price": order_params.get("price"),
-                "timestamp": datetime.now().isoformat(),
+                "price": order_params.price,
+                "timestamp_ns": time.time_ns(),
                 "signal": signal
             }
             
@@ -195,15 +362,22 @@ class KalshiTrader:
                 "signal": signal
             }
     
-    def _calculate_order_params(self, action: str, size: float, order_book: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_order_params(self, action: str, size: float, order_book: Dict[str, Any]) -> OrderParams:
         """Calculate order parameters based on market data"""
         try:
             # This is a simplified order parameter calculation
             # In practice, you'd implement more sophisticated order routing
             
-            # Get best bid/ask prices
-            best_bid = order_book.get("bids", [{}])[0].get("price", 0.5)
-            best_ask = order_book.get("asks", [{}])[0].get("price", 0.5)
+            # Get best bid/ask prices, indexing the usual order book shape
+            # directly and falling back to 0.5 only for a side that is empty
+            try:
+                best_bid = order_book["bids"][0]["price"]
+            except (KeyError, IndexError):
+                best_bid = 0.5
+            try:
+                best_ask = order_book["asks"][0]["price"]
+            except (KeyError, IndexError):
+                best_ask = 0.5
             
             # Calculate order price
             if action == "BUY":
@@ -211,31 +385,24 @@ class KalshiTrader:
             else:  # SELL
                 price = best_bid  # Market sell
             
-            return {
-                "price": price,
-                "size": size,
-                "type": "market"
-            }
+            return OrderParams(price, size)
             
         except Exception as e:
             logger.error(f"Order parameter calculation failed: {e}")
-            return {
-                "price": 0.5,
-                "size": size,
-                "type": "market"
-            }
+            return OrderParams(0.5, size)
     
-    async def _simulate_order_placement(self, order_params: Dict[str, Any]) -> Dict[str, Any]:
+    async def _simulate_order_placement(self, order_params: OrderParams) -> OrderFill:
         """Simulate order placement (replace with actual API call)"""
         # This is a simulation - replace with actual Kalshi API calls
-        await asyncio.sleep(0.1)  # Simulate API delay
+        if self._sim_delay:
+            await asyncio.sleep(self._sim_delay)  # Simulate API delay
         
-        return {
-            "order_id": f"sim_{datetime.now().timestamp()}",
-            "status": "filled",
-            "filled_price": order_params["price"],
-            "filled_size": order_params["size"]
-        }
+        return OrderFill(
+            order_id=f"sim_{_BOOT_NS}_{next(_ORDER_SEQ)}",
+            status="filled",
+            filled_price=order_params.price,
+            filled_size=order_params.size
+        )
     
     async def _update_portfolio(self, execution_result: Dict[str, Any]):
         """Update portfolio tracking after trade execution"""
@@ -254,7 +421,10 @@ class KalshiTrader:
                 else:  # SELL
                     self.positions[contract_id] -= size
                 
-                logger.info(f"Updated position for {contract_id}: {self.positions[contract_id]}")
+                logger.info("Updated position for {}: {}", contract_id, self.positions[contract_id])
+                
+                # Positions changed, so the cached portfolio is stale
+                self._portfolio_cache = None
                 
         except Exception as e:
             logger.error(f"Portfolio update failed: {e}")
@@ -270,41 +440,62 @@ class KalshiTrader:
             if not self.api_collector:
                 return self._get_simulated_portfolio()
             
-            # Get real portfolio data from Kalshi
-            balance = await self.api_collector.get_user_balance()
-            positions = await self.api_collector.get_user_positions()
+            # Get real portfolio data from Kalshi, both requests in flight at once
+            balance, positions = await asyncio.gather(
+                self.api_collector.get_user_balance(),
+                self.api_collector.get_user_positions()
+            )
             
             # Calculate total value
-            total_value = float(balance.get("balance", 0.0))
-            
-            # Add position values
-            for position in positions:
-                contract_id = position.get("contract_id")
-                size = float(position.get("size", 0.0))
-                current_price = float(position.get("current_price", 0.5))
-                
-                if contract_id and size != 0:
-                    position_value = size * current_price
-                    total_value += position_value
+            cash_balance = float(balance.get("balance", 0.0))
+            
+            # Add position values, skipping positions without a contract
+            sizes = np.fromiter(
+                (float(position.get("size", 0.0)) if position.get("contract_id") else 0.0
+                 for position in positions),
+                dtype=np.float64,
+                count=len(positions)
+            )
+            prices = np.fromiter(
+                (float(position.get("current_price", 0.5)) for position in positions),
+                dtype=np.float64,
+                count=len(positions)
+            )
+            total_value = cash_balance + float(np.dot(sizes, prices))
             
             return {
                 "total_value": total_value,
-                "cash_balance": float(balance.get("balance", 0.0)),
+                "cash_balance": cash_balance,
                 "positions": positions,
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": time.time_ns()
             }
             
         except Exception as e:
             logger.error(f"Portfolio retrieval failed: {e}")
             return self._get_simulated_portfolio()
     
+    async def _get_portfolio_cached(self) -> Dict[str, Any]:
+        """
+        Get the portfolio, reusing the last result while it is fresh
+        
+        Returns:
+            Portfolio information dictionary
+        """
+        now = time.monotonic()
+        if self._portfolio_cache is not None and now - self._portfolio_ts < self._portfolio_ttl:
+            return self._portfolio_cache
+        
+        self._portfolio_cache = await self.get_portfolio()
+        self._portfolio_ts = now
+        return self._portfolio_cache
+    
     def _get_simulated_portfolio(self) -> Dict[str, Any]:
         """Get simulated portfolio data"""
         return {
             "total_value": 10000.0,  # $10,000 simulated portfolio
             "cash_balance": 5000.0,
             "positions": [],
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "simulated": True
         }
     
@@ -356,17 +547,18 @@ class KalshiTrader:
             Cancellation result
         """
         try:
-            logger.info(f"Cancelling order: {order_id}")
+            logger.info("Cancelling order: {}", order_id)
             
             # This would be an actual API call to cancel the order
             # For now, we'll simulate it
             
-            await asyncio.sleep(0.1)  # Simulate API delay
+            if self._sim_delay:
+                await asyncio.sleep(self._sim_delay)  # Simulate API delay
             
             return {
                 "status": "CANCELLED",
                 "order_id": order_id,
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": time.time_ns()
             }
             
         except Exception as e:
@@ -382,10 +574,12 @@ class KalshiTrader:
         try:
             logger.info("Closing Kalshi Trader")
             
-            # Cancel any pending orders
+            # Cancel any pending orders concurrently
             orders = await self.get_orders("open")
-            for order in orders:
-                await self.cancel_order(order.get("order_id", ""))
+            await asyncio.gather(
+                *(self.cancel_order(order.get("order_id", "")) for order in orders),
+                return_exceptions=True
+            )
             
             logger.info("Kalshi Trader closed")
             
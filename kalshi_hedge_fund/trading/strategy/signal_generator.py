@@ -6,14 +6,26 @@ LLM reasoning and statistical analysis.
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
+import itertools
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
 
 try:
     from loguru import logger
 except ImportError:
     import logging
-    logger = logging.getLogger(__name__)
+    from ...utils.logger import BraceStyleAdapter
+    logger = BraceStyleAdapter(logging.getLogger(__name__), {})
+
+
+# Weight of each signal source when combining confidences
+SIGNAL_WEIGHTS = {
+    "llm": 0.6,  # LLM gets higher weight
+    "statistical": 0.4
+}
+
+# Recommendation lists at least this long are scanned with NumPy instead of max()
+ARGMAX_MIN_LENGTH = 8
 
 
 class SignalGenerator:
@@ -24,6 +36,14 @@ class SignalGenerator:
     actionable trading signals with confidence levels.
     """
     
+    __slots__ = (
+        "config", "min_confidence", "buy_threshold", "sell_threshold", "hold_threshold",
+        "_sources", "_weights", "_seq"
+    )
+    
+    _REQUIRED_FIELDS = frozenset(("action", "confidence"))
+    _VALID_ACTIONS = frozenset(("BUY", "SELL", "HOLD"))
+    
     def __init__(self, config):
         """
         Initialize the signal generator
@@ -39,8 +59,20 @@ class SignalGenerator:
         self.sell_threshold = 0.4  # 40% probability for sell signal
         self.hold_threshold = 0.1  # 10% confidence difference for hold
         
+        # Source order and weights as arrays, for vectorized combination
+        self._sources = tuple(SIGNAL_WEIGHTS)
+        self._weights = np.array([SIGNAL_WEIGHTS[source] for source in self._sources], dtype=np.float64)
+        
+        # Tie-breaker for heap entries, so equal confidences never compare the dicts
+        self._seq = itertools.count()
+        
         logger.info("Signal Generator initialized")
     
+    @staticmethod
+    def _now() -> float:
+        """Current event loop time (monotonic seconds)"""
+        return asyncio.get_running_loop().time()
+    
     async def generate_signal(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate trading signal from analysis results
@@ -72,13 +104,30 @@ class SignalGenerator:
             # Combine signals
             combined_signal = self._combine_signals(signals, analysis)
             
-            logger.info(f"Generated signal: {combined_signal.get('action', 'UNKNOWN')}")
+            logger.info("Generated signal: {}", combined_signal.get("action", "UNKNOWN"))
             return combined_signal
             
         except Exception as e:
             logger.error(f"Signal generation failed: {e}")
             return self._fallback_signal(analysis)
     
+    async def generate_signal_heap_entry(self, analysis: Dict[str, Any]) -> Tuple[float, int, Dict[str, Any]]:
+        """
+        Generate a trading signal wrapped for a heapq priority queue
+        
+        Entries compare as plain tuples, so heapq orders them by highest
+        confidence first, then by generation order, without comparing the
+        signal dictionaries themselves.
+        
+        Args:
+            analysis: Analysis results dictionary containing LLM and statistical analysis
+            
+        Returns:
+            Tuple of (negated confidence, sequence number, trading signal dictionary)
+        """
+        signal = await self.generate_signal(analysis)
+        return -signal.get("confidence", 0.0), next(self._seq), signal
+    
     def _generate_llm_signal(self, llm_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Generate signal from LLM analysis"""
         try:
@@ -91,10 +140,18 @@ class SignalGenerator:
                 return {"action": "HOLD", "confidence": 0.0, "reason": "No LLM recommendations"}
             
             # Find the highest confidence recommendation
-            best_recommendation = max(recommendations, key=lambda x: x.get("confidence", 0))
+            if len(recommendations) < ARGMAX_MIN_LENGTH:
+                best_recommendation = max(recommendations, key=lambda x: x.get("confidence", 0))
+            else:
+                confidences = np.fromiter(
+                    (recommendation.get("confidence", 0.0) for recommendation in recommendations),
+                    dtype=np.float64,
+                    count=len(recommendations)
+                )
+                best_recommendation = recommendations[int(confidences.argmax())]
             
             return {
-                "action": best_recommendation.get("action", "HOLD"),
+                "action": str(best_recommendation.get("action", "HOLD")).upper(),
                 "confidence": best_recommendation.get("confidence", 0.0),
                 "reason": best_recommendation.get("reasoning", "LLM recommendation"),
                 "source": "llm"
@@ -140,32 +197,19 @@ class SignalGenerator:
             if not signals:
                 return {"action": "HOLD", "confidence": 0.0, "reason": "No signals available"}
             
-            # Weight the signals
-            weights = {
-                "llm": 0.6,  # LLM gets higher weight
-                "statistical": 0.4
-            }
+            reasons = [
+                f"{source}: {signal.get('reason', 'No reason')}"
+                for source, signal in signals.items()
+                if source in SIGNAL_WEIGHTS
+            ]
             
-            combined_action = "HOLD"
-            combined_confidence = 0.0
-            total_weight = 0.0
-            reasons = []
-            
-            for source, signal in signals.items():
-                if source in weights:
-                    weight = weights[source]
-                    total_weight += weight
-                    
-                    # Convert actions to numerical values for averaging
-                    action_value = self._action_to_value(signal.get("action", "HOLD"))
-                    confidence = signal.get("confidence", 0.0)
-                    
-                    combined_confidence += confidence * weight
-                    reasons.append(f"{source}: {signal.get('reason', 'No reason')}")
-            
-            # Normalize confidence
-            if total_weight > 0:
-                combined_confidence /= total_weight
+            # Weighted average of confidences over the sources present
+            confidences = np.array(
+                [[signals[source].get("confidence", 0.0) if source in signals else np.nan
+                  for source in self._sources]],
+                dtype=np.float64
+            )
+            combined_confidence = float(self.combine_signals_batch(confidences)[0])
             
             # Convert back to action
             combined_action = self._value_to_action(combined_confidence)
@@ -180,23 +224,33 @@ class SignalGenerator:
                 "confidence": combined_confidence,
                 "reasons": reasons,
                 "individual_signals": signals,
-                "weights_used": weights,
+                "weights_used": dict(SIGNAL_WEIGHTS),
                 "contract_id": analysis.get("contract_id"),
-                "timestamp": asyncio.get_event_loop().time()
+                "timestamp": self._now()
             }
             
         except Exception as e:
             logger.error(f"Signal combination failed: {e}")
             return {"action": "HOLD", "confidence": 0.0, "reason": f"Combination error: {e}"}
     
-    def _action_to_value(self, action: str) -> float:
-        """Convert action to numerical value"""
-        action_map = {
-            "BUY": 1.0,
-            "HOLD": 0.5,
-            "SELL": 0.0
-        }
-        return action_map.get(action.upper(), 0.5)
+    def combine_signals_batch(self, confidences: np.ndarray) -> np.ndarray:
+        """
+        Combine source confidences for many contracts at once
+        
+        Args:
+            confidences: (n_contracts, n_sources) array of confidences, with
+                columns ordered as SIGNAL_WEIGHTS and NaN for a missing source
+            
+        Returns:
+            Array of weighted average confidences, 0.0 where no source is present
+        """
+        confidences = np.asarray(confidences, dtype=np.float64)
+        present = ~np.isnan(confidences)
+        
+        weighted = np.where(present, confidences, 0.0) @ self._weights
+        total_weight = present @ self._weights
+        
+        return np.divide(weighted, total_weight, out=np.zeros_like(weighted), where=total_weight > 0)
     
     def _value_to_action(self, value: float) -> str:
         """Convert numerical value back to action"""
@@ -214,7 +268,7 @@ class SignalGenerator:
             "confidence": 0.0,
             "reason": "Signal generation failed",
             "contract_id": analysis.get("contract_id"),
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": self._now()
         }
     
     def validate_signal(self, signal: Dict[str, Any]) -> bool:
@@ -229,22 +283,20 @@ class SignalGenerator:
         """
         try:
             # Check required fields
-            required_fields = ["action", "confidence"]
-            for field in required_fields:
-                if field not in signal:
-                    logger.warning(f"Signal missing required field: {field}")
-                    return False
+            missing_fields = self._REQUIRED_FIELDS - signal.keys()
+            if missing_fields:
+                logger.warning("Signal missing required fields: {}", sorted(missing_fields))
+                return False
             
             # Validate action
-            valid_actions = ["BUY", "SELL", "HOLD"]
-            if signal["action"] not in valid_actions:
-                logger.warning(f"Invalid action: {signal['action']}")
+            if signal["action"] not in self._VALID_ACTIONS:
+                logger.warning("Invalid action: {}", signal["action"])
                 return False
             
             # Validate confidence
             confidence = signal["confidence"]
             if not (0.0 <= confidence <= 1.0):
-                logger.warning(f"Invalid confidence: {confidence}")
+                logger.warning("Invalid confidence: {}", confidence)
                 return False
             
             return True
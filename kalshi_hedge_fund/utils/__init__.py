@@ -2,6 +2,10 @@
 Utility modules for Kalshi AI Hedge Fund Framework
 """
 
+from .event_loop import run_async
 from .logger import setup_logging
+from .serialization import dump_json, dump_json_async, dumps_json, loads_json
+from .timestamps import iso_timestamp, with_iso_timestamps
 
-__all__ = ["setup_logging"]
\ No newline at end of file
+__all__ = ["run_async", "setup_logging", "dump_json", "dump_json_async", "dumps_json", "loads_json",
+           "iso_timestamp", "with_iso_timestamps"]
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Event loop selection for Kalshi AI Hedge Fund Framework
+
+Runs coroutines on uvloop when it is installed (not available on Windows)
+and falls back to the standard asyncio event loop.
+"""
+
+import asyncio
+import sys
+from typing import Any, Coroutine
+
+try:
+    if sys.platform == "win32":
+        raise ImportError("uvloop does not support Windows")
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run_async(main: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion on a new event loop
+    
+    Drop-in replacement for asyncio.run that uses uvloop when available.
+    
+    Args:
+        main: Coroutine to run
+    
+    Returns:
+        The coroutine's result
+    """
+    if uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
\ No newline at end of file
@@ -2,49 +2,52 @@
 Logging configuration for Kalshi AI Hedge Fund Framework
 """
 
+import logging
 import sys
 from typing import Optional
 
 try:
     from loguru import logger
 except ImportError:
-    # Fallback logging if loguru is not available
-    import logging
+    # Fallback logging if loguru is not available; call sites use the
+    # stdlib logger directly, with no wrapper in between
+    import types
     
-    class LoggerWrapper:
-        def __init__(self):
-            self.logger = logging.getLogger("kalshi_hedge_fund")
-            self.logger.setLevel(logging.INFO)
-            
-            if not self.logger.handlers:
-                handler = logging.StreamHandler(sys.stdout)
-                formatter = logging.Formatter(
-                    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-                )
-                handler.setFormatter(formatter)
-                self.logger.addHandler(handler)
-        
-        def info(self, message):
-            self.logger.info(message)
-        
-        def error(self, message):
-            self.logger.error(message)
-        
-        def warning(self, message):
-            self.logger.warning(message)
-        
-        def debug(self, message):
-            self.logger.debug(message)
-        
-        def remove(self):
-            """Remove all handlers (no-op for basic logging)"""
-            pass
-        
-        def add(self, sink, level=None, format=None, **kwargs):
-            """Add handler (no-op for basic logging)"""
-            pass
+    logger = logging.getLogger("kalshi_hedge_fund")
+    logger.setLevel(logging.INFO)
+    
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    
+    def _remove(self):
+        """Remove all handlers (no-op for basic logging)"""
+        pass
+    
+    def _add(self, sink, level=None, format=None, **kwargs):
+        """Add handler (no-op for basic logging)"""
+        pass
+    
+    # loguru-compatible methods used by setup_logging
+    logger.remove = types.MethodType(_remove, logger)
+    logger.add = types.MethodType(_add, logger)
+
+
+class BraceStyleAdapter(logging.LoggerAdapter):
+    """
+    Accept loguru-style "{}" arguments, formatting only emitted records
+    
+    Used by modules that log with "{}" arguments to wrap their stdlib logger
+    when loguru is not installed.
+    """
     
-    logger = LoggerWrapper()
+    def log(self, level, msg, *args, **kwargs):
+        if self.isEnabledFor(level):
+            self.logger.log(level, msg.format(*args) if args else msg, **kwargs)
 
 
 def setup_logging(level: str = "INFO", log_file: Optional[str] = None):
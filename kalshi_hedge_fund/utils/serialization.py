@@ -0,0 +1,77 @@
+"""
+JSON serialization helpers for Kalshi AI Hedge Fund Framework
+
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import asyncio
+import json
+from typing import Any
+
+try:
+    import orjson
+    _ORJSON_OPTIONS = (
+        orjson.OPT_INDENT_2
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_NAIVE_UTC
+        | orjson.OPT_NON_STR_KEYS
+    )
+except ImportError:
+    orjson = None
+
+
+def dumps_json(obj: Any, indent: bool = True) -> bytes:
+    """
+    Serialize an object to JSON
+    
+    Args:
+        obj: Object to serialize; unknown types are converted with str()
+        indent: Indent with two spaces; otherwise emit a single line
+        
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        option = _ORJSON_OPTIONS if indent else _ORJSON_OPTIONS & ~orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode("utf-8")
+
+
+def loads_json(data: bytes) -> Any:
+    """
+    Deserialize a JSON document
+    
+    Args:
+        data: JSON document as bytes or str
+        
+    Returns:
+        Deserialized object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj: Any, path: str):
+    """
+    Write an object to a file as indented JSON
+    
+    Args:
+        obj: Object to serialize
+        path: Output file path
+    """
+    with open(path, "wb") as f:
+        f.write(dumps_json(obj))
+
+
+async def dump_json_async(obj: Any, path: str):
+    """
+    Write an object to a file as indented JSON without blocking the event loop
+    
+    Serialization and the file write both run in a worker thread.
+    
+    Args:
+        obj: Object to serialize
+        path: Output file path
+    """
+    await asyncio.to_thread(dump_json, obj, path)
@@ -0,0 +1,37 @@
+"""
+Record timestamps for Kalshi AI Hedge Fund Framework
+
+Trader and risk monitor records are stamped with epoch nanoseconds in
+"timestamp_ns", which is cheap to take on every record. ISO 8601 strings are
+only formatted where records leave the framework.
+"""
+
+from datetime import datetime
+from typing import Any
+
+
+def iso_timestamp(timestamp_ns: int) -> str:
+    """Format an epoch nanosecond timestamp as a local ISO 8601 string"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
+
+def with_iso_timestamps(value: Any) -> Any:
+    """
+    Copy of a result with an ISO 8601 "timestamp" next to every "timestamp_ns"
+    
+    Dictionaries that already have a "timestamp" keep it.
+    
+    Args:
+        value: Result made of dictionaries, lists and scalars
+        
+    Returns:
+        The result with ISO timestamps added
+    """
+    if isinstance(value, dict):
+        result = {key: with_iso_timestamps(item) for key, item in value.items()}
+        if "timestamp_ns" in result and "timestamp" not in result:
+            result["timestamp"] = iso_timestamp(result["timestamp_ns"])
+        return result
+    if isinstance(value, list):
+        return [with_iso_timestamps(item) for item in value]
+    return value
\ No newline at end of file
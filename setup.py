@@ -45,6 +45,14 @@ setup(
             "sphinx>=7.0.0",
             "sphinx-rtd-theme>=1.3.0",
         ],
+        "speedups": [
+            "orjson>=3.9.0",
+            "numba>=0.58.0",
+            "fastembed>=0.2.0",
+            "tiktoken>=0.5.0",
+            "h2>=4.1.0",
+            "uvloop>=0.19.0; sys_platform != 'win32'",
+        ],
     },
     entry_points={
         "console_scripts": [